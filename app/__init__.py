@@ -8,10 +8,8 @@ from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_wtf.csrf import CSRFProtect
-from flask_admin import Admin
-from flask_admin.contrib.sqla import ModelView
 from config import Config
-import os
+from functools import lru_cache
 
 # Import db from models
 from app.models import db
@@ -22,6 +20,54 @@ login_manager = LoginManager()
 mail = Mail()
 csrf = CSRFProtect()
 
+# Template for the admin "Database Schema" page
+SCHEMA_HTML_TEMPLATE = """
+<html>
+<head>
+    <title>Database Schema</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        table { border-collapse: collapse; width: 100%; margin-bottom: 30px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        .primary-key { background-color: #ffffcc; font-weight: bold; }
+        .foreign-key { background-color: #e6f3ff; }
+        .table-name { color: #333; font-size: 18px; font-weight: bold; margin-top: 20px; }
+    </style>
+</head>
+<body>
+    <h1>Database Schema Information</h1>
+    {% for table in tables_info %}
+        <div class="table-name">{{ table.name }}</div>
+        <table>
+            <thead>
+                <tr>
+                    <th>Column Name</th>
+                    <th>Type</th>
+                    <th>Nullable</th>
+                    <th>Primary Key</th>
+                    <th>Foreign Keys</th>
+                    <th>Default</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for column in table.columns %}
+                <tr class="{% if column.primary_key %}primary-key{% elif column.foreign_keys %}foreign-key{% endif %}">
+                    <td>{{ column.name }}</td>
+                    <td>{{ column.type }}</td>
+                    <td>{{ column.nullable }}</td>
+                    <td>{{ column.primary_key }}</td>
+                    <td>{{ column.foreign_keys|join(', ') }}</td>
+                    <td>{{ column.default or 'None' }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+    {% endfor %}
+</body>
+</html>
+"""
+
 
 def create_app(config_class=Config):
     """
@@ -54,24 +100,17 @@ def create_app(config_class=Config):
     setup_request_logging(app)
     setup_error_monitoring(app)
 
+    # Use orjson for JSON requests/responses when available
+    from app.json_provider import setup_json_provider
+    setup_json_provider(app)
+
     # Set up HTTPS enforcement middleware
-    from app.security import setup_https_middleware
+    # (this is the only HTTPS redirect; it runs before Flask sees the request)
+    from app.security import setup_https_middleware, setup_password_hashing
     setup_https_middleware(app)
 
-    # HTTPS Enforcement
-    @app.before_request
-    def force_https():
-        """Force HTTPS for all requests if configured"""
-        from flask import request, redirect, url_for
-        
-        if (app.config.get('FORCE_HTTPS', False) and 
-            not request.is_secure and 
-            request.headers.get('X-Forwarded-Proto', 'http') != 'https' and
-            request.endpoint != 'static'):  # Don't redirect static files
-            
-            # Build HTTPS URL
-            https_url = request.url.replace('http://', 'https://')
-            return redirect(https_url, code=301)
+    # Optional process pool for password hashing (PASSWORD_HASH_WORKERS)
+    setup_password_hashing(app)
 
     # Security Headers
     @app.after_request
@@ -95,9 +134,6 @@ def create_app(config_class=Config):
         
         return response
 
-    # Initialize Flask-Admin
-    admin_instance = Admin(app, name="Travel App Admin", template_mode="bootstrap4")
-
     # Configure Flask-Login
     login_manager.login_view = "auth.login"  # Redirect unauthorized users to login
     login_manager.login_message = "Please log in to access this page."
@@ -108,14 +144,86 @@ def create_app(config_class=Config):
         """
         Load user by ID for Flask-Login.
         This callback is used to reload the user object from the user ID stored in the session.
+        Session.get checks the identity map before issuing a SELECT.
         """
         from app.models import User
 
-        return User.query.get(int(user_id))
+        return db.session.get(User, int(user_id))
 
-    # Set up Flask-Admin views
-    from app.models import User, Tour, Category, Booking
+    # Set up Flask-Admin (skipped entirely when ENABLE_ADMIN is off)
+    if app.config.get("ENABLE_ADMIN", True):
+        _init_admin(app)
+
+    # Register blueprints (URL routing modules)
+    from app.routes.main import main_bp
+    from app.routes.auth import auth_bp
+    from app.routes.tours import tours_bp
+    from app.routes.bookings import bookings_bp
+    from app.routes.payment import payment_bp
+
+    app.register_blueprint(main_bp)
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(tours_bp, url_prefix="/tours")
+    app.register_blueprint(bookings_bp, url_prefix="/bookings")
+    app.register_blueprint(payment_bp, url_prefix="/payment")
+
+    # Note: Error handlers are now set up in logging_config.py
+    # This provides comprehensive error logging and monitoring
+
+    return app
+
+
+def _iter_schema_tables():
+    """
+    Yield table and column details from the SQLAlchemy metadata one
+    table at a time, so a wide schema is never held as one big list.
+    """
+    for table_name, table in db.metadata.tables.items():
+        columns_info = [
+            {
+                "name": column.name,
+                "type": str(column.type),
+                "nullable": column.nullable,
+                "primary_key": column.primary_key,
+                "foreign_keys": [
+                    str(fk.target_fullname) for fk in column.foreign_keys
+                ],
+                "default": str(column.default) if column.default else None,
+            }
+            for column in table.columns
+        ]
+        yield {"name": table_name, "columns": columns_info}
+
+
+@lru_cache(maxsize=1)
+def _render_schema_html():
+    """
+    Render the database schema page.
+    The table metadata is fixed for the life of the process, so the
+    rendered HTML is built on the first hit and reused afterwards.
+    """
+    from flask import render_template_string
+
+    return render_template_string(
+        SCHEMA_HTML_TEMPLATE, tables_info=_iter_schema_tables()
+    )
+
+
+def _init_admin(app):
+    """
+    Register the Flask-Admin interface and its model views.
+    Flask-Admin is imported here rather than at module level so apps
+    created with ENABLE_ADMIN off never pay its import cost.
+
+    Args:
+        app: Flask application instance
+    """
+
+    from flask_admin import Admin, BaseView, expose
     from flask_admin.contrib.sqla import ModelView
+    from app.models import User, Tour, Category, Booking
+
+    admin_instance = Admin(app, name="Travel App Admin", template_mode="bootstrap4")
 
     class UserAdmin(ModelView):
         column_display_pk = True  # Show primary key
@@ -187,100 +295,9 @@ def create_app(config_class=Config):
     admin_instance.add_view(BookingAdmin(Booking, db.session, name="Bookings"))
 
     # Add a custom view for database schema information
-    from flask_admin import BaseView, expose
-    from flask import render_template_string
-
     class SchemaView(BaseView):
         @expose("/")
         def index(self):
-            # Get table information from SQLAlchemy metadata
-            tables_info = []
-            for table_name, table in db.metadata.tables.items():
-                columns_info = []
-                for column in table.columns:
-                    col_info = {
-                        "name": column.name,
-                        "type": str(column.type),
-                        "nullable": column.nullable,
-                        "primary_key": column.primary_key,
-                        "foreign_keys": [
-                            str(fk.target_fullname) for fk in column.foreign_keys
-                        ],
-                        "default": str(column.default) if column.default else None,
-                    }
-                    columns_info.append(col_info)
-
-                tables_info.append({"name": table_name, "columns": columns_info})
-
-            html_template = """
-            <html>
-            <head>
-                <title>Database Schema</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    table { border-collapse: collapse; width: 100%; margin-bottom: 30px; }
-                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                    th { background-color: #f2f2f2; }
-                    .primary-key { background-color: #ffffcc; font-weight: bold; }
-                    .foreign-key { background-color: #e6f3ff; }
-                    .table-name { color: #333; font-size: 18px; font-weight: bold; margin-top: 20px; }
-                </style>
-            </head>
-            <body>
-                <h1>Database Schema Information</h1>
-                {% for table in tables_info %}
-                    <div class="table-name">{{ table.name }}</div>
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Column Name</th>
-                                <th>Type</th>
-                                <th>Nullable</th>
-                                <th>Primary Key</th>
-                                <th>Foreign Keys</th>
-                                <th>Default</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {% for column in table.columns %}
-                            <tr class="{% if column.primary_key %}primary-key{% elif column.foreign_keys %}foreign-key{% endif %}">
-                                <td>{{ column.name }}</td>
-                                <td>{{ column.type }}</td>
-                                <td>{{ column.nullable }}</td>
-                                <td>{{ column.primary_key }}</td>
-                                <td>{{ column.foreign_keys|join(', ') }}</td>
-                                <td>{{ column.default or 'None' }}</td>
-                            </tr>
-                            {% endfor %}
-                        </tbody>
-                    </table>
-                {% endfor %}
-            </body>
-            </html>
-            """
-
-            return render_template_string(html_template, tables_info=tables_info)
+            return _render_schema_html()
 
     admin_instance.add_view(SchemaView(name="Database Schema", endpoint="schema"))
-
-    # Create upload directories if they don't exist
-    upload_path = os.path.join(app.instance_path, "static", "images", "uploads")
-    os.makedirs(upload_path, exist_ok=True)
-
-    # Register blueprints (URL routing modules)
-    from app.routes.main import main_bp
-    from app.routes.auth import auth_bp
-    from app.routes.tours import tours_bp
-    from app.routes.bookings import bookings_bp
-    from app.routes.payment import payment_bp
-
-    app.register_blueprint(main_bp)
-    app.register_blueprint(auth_bp, url_prefix="/auth")
-    app.register_blueprint(tours_bp, url_prefix="/tours")
-    app.register_blueprint(bookings_bp, url_prefix="/bookings")
-    app.register_blueprint(payment_bp, url_prefix="/payment")
-
-    # Note: Error handlers are now set up in logging_config.py
-    # This provides comprehensive error logging and monitoring
-
-    return app
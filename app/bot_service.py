@@ -3,17 +3,21 @@ Simple AI chatbot service for handling travel inquiries.
 """
 import re
 from datetime import datetime
+from types import MappingProxyType
 
+try:
+    import ahocorasick
+except ImportError:  # Fall back to the regex screen below
+    ahocorasick = None
 
-class SimpleInquiryBot:
-    """Simple chatbot that handles common travel inquiries."""
-    
-    def __init__(self):
-        # Simple keyword-based responses
-        self.responses = {
-            'booking': {
-                'keywords': ['book', 'booking', 'reserve', 'reservation', 'available', 'availability'],
-                'response': """Thank you for your booking inquiry! Here's what you need to know:
+# Automaton payload marking the escalation keywords
+HUMAN_CATEGORY = '__human__'
+
+# Keyword-based response templates, shared by every bot instance
+RESPONSES = MappingProxyType({
+    'booking': {
+        'keywords': ['book', 'booking', 'reserve', 'reservation', 'available', 'availability'],
+        'response': """Thank you for your booking inquiry! Here's what you need to know:
 
 📅 **How to Book:**
 1. Browse our tours on the Tours page
@@ -26,10 +30,10 @@ class SimpleInquiryBot:
 ✉️ **Email:** affordablescapes@gmail.com
 
 We'll process your booking within 24 hours and send you a confirmation email!"""
-            },
-            'pricing': {
-                'keywords': ['price', 'cost', 'fee', 'money', 'payment', 'cheap', 'expensive', 'discount'],
-                'response': """Here's information about our pricing:
+    },
+    'pricing': {
+        'keywords': ['price', 'cost', 'fee', 'money', 'payment', 'cheap', 'expensive', 'discount'],
+        'response': """Here's information about our pricing:
 
 💰 **Tour Prices:** Range from $50-$500 depending on destination and duration
 🎯 **What's Included:** Transportation, accommodation, meals, and guided tours
@@ -38,10 +42,10 @@ We'll process your booking within 24 hours and send you a confirmation email!"""
 📅 **Early Bird:** Book 30 days in advance for 15% discount
 
 Visit our Tours page to see specific prices for each destination!"""
-            },
-            'cancellation': {
-                'keywords': ['cancel', 'cancellation', 'refund', 'reschedule', 'change'],
-                'response': """Our cancellation and refund policy:
+    },
+    'cancellation': {
+        'keywords': ['cancel', 'cancellation', 'refund', 'reschedule', 'change'],
+        'response': """Our cancellation and refund policy:
 
 ✅ **Free Cancellation:** Up to 48 hours before tour date
 💰 **Refund Policy:**
@@ -53,10 +57,10 @@ Visit our Tours page to see specific prices for each destination!"""
 📞 **To Cancel:** Contact us immediately at +256 705 908 699
 
 We understand plans change - we're here to help!"""
-            },
-            'general': {
-                'keywords': ['hello', 'hi', 'help', 'info', 'about', 'what', 'where', 'when'],
-                'response': """Welcome to Affordable Escapes! 🌍
+    },
+    'general': {
+        'keywords': ['hello', 'hi', 'help', 'info', 'about', 'what', 'where', 'when'],
+        'response': """Welcome to Affordable Escapes! 🌍
 
 We're your trusted travel partner offering amazing tours across Uganda and East Africa.
 
@@ -70,23 +74,121 @@ We're your trusted travel partner offering amazing tours across Uganda and East
 - Contact Us: +256 705 908 699 or affordablescapes@gmail.com
 
 What would you like to know more about?"""
-            }
+    }
+})
+
+# Keywords that mean an inquiry should be escalated to a human
+HUMAN_KEYWORDS = (
+    'complaint', 'problem', 'issue', 'angry', 'disappointed', 'terrible', 'awful'
+)
+
+
+class SimpleInquiryBot:
+    """Simple chatbot that handles common travel inquiries."""
+
+    __slots__ = (
+        'responses',
+        'category_keywords',
+        'human_keywords',
+        'human_pattern',
+        'response_texts',
+        'automaton',
+    )
+    
+    def __init__(self):
+        self.responses = RESPONSES
+
+        # Keyword tables are fixed for the lifetime of the bot, so build
+        # them once here rather than on every inquiry. Each category also
+        # gets a single alternation pattern so categories with no hits are
+        # rejected in one pass over the text.
+        self.category_keywords = tuple(
+            (category, self._union_pattern(data['keywords']), tuple(data['keywords']))
+            for category, data in self.responses.items()
+        )
+        self.human_keywords = HUMAN_KEYWORDS
+        self.human_pattern = self._union_pattern(self.human_keywords)
+        self.response_texts = {
+            category: data['response'] for category, data in self.responses.items()
         }
+        self.automaton = self._build_automaton()
+
+    def _build_automaton(self):
+        """
+        Build one Aho-Corasick automaton over every keyword so an inquiry
+        is classified in a single linear pass. Returns None when
+        pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+
+        owners = {}
+        for category, _, keywords in self.category_keywords:
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(category)
+        for keyword in self.human_keywords:
+            owners.setdefault(keyword, []).append(HUMAN_CATEGORY)
+
+        automaton = ahocorasick.Automaton()
+        for keyword, categories in owners.items():
+            automaton.add_word(keyword, (keyword, tuple(categories)))
+        automaton.make_automaton()
+        return automaton
+
+    def _count_matches(self, text):
+        """
+        Count distinct keywords found in text per category.
+        Escalation keywords are counted under HUMAN_CATEGORY.
+        """
+        counts = {}
+
+        if self.automaton is not None:
+            seen = set()
+            for _, (keyword, categories) in self.automaton.iter(text):
+                if keyword in seen:
+                    continue
+                seen.add(keyword)
+                for category in categories:
+                    counts[category] = counts.get(category, 0) + 1
+            return counts
+
+        for category, pattern, keywords in self.category_keywords:
+            if not pattern.search(text):
+                continue
+            counts[category] = sum(1 for keyword in keywords if keyword in text)
+
+        if self.human_pattern.search(text):
+            counts[HUMAN_CATEGORY] = 1
+
+        return counts
+
+    @staticmethod
+    def normalize_text(message, subject=""):
+        """Build the lowercased text that keywords are matched against."""
+        return f"{subject} {message}".lower()
+
+    @staticmethod
+    def _union_pattern(keywords):
+        """Compile literal keywords into one substring-matching pattern."""
+        return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
     
-    def analyze_inquiry(self, message, subject=""):
-        """Analyze inquiry and determine if bot can handle it."""
-        text = f"{subject} {message}".lower()
+    def analyze_inquiry(self, message, subject="", text=None):
+        """
+        Analyze inquiry and determine if bot can handle it.
+        Callers that already hold the lowercased "subject message" text can
+        pass it as text to skip building it again.
+        """
+        if text is None:
+            text = self.normalize_text(message, subject)
         
+        counts = self._count_matches(text)
+
         # Find best matching category
         best_match = None
         max_matches = 0
         
-        for category, data in self.responses.items():
-            matches = 0
-            for keyword in data['keywords']:
-                if keyword in text:
-                    matches += 1
-            
+        for category, _, _ in self.category_keywords:
+            matches = counts.get(category, 0)
             if matches > max_matches:
                 max_matches = matches
                 best_match = category
@@ -95,8 +197,7 @@ What would you like to know more about?"""
         confidence = min(max_matches * 0.3, 1.0)
         
         # Check for complex patterns that need human attention
-        human_keywords = ['complaint', 'problem', 'issue', 'angry', 'disappointed', 'terrible', 'awful']
-        needs_human = any(word in text for word in human_keywords)
+        needs_human = HUMAN_CATEGORY in counts
         
         return {
             'category': best_match,
@@ -107,9 +208,7 @@ What would you like to know more about?"""
     
     def generate_response(self, category):
         """Generate response for a given category."""
-        if category in self.responses:
-            return self.responses[category]['response']
-        return None
+        return self.response_texts.get(category)
     
     def process_inquiry(self, inquiry):
         """Main method to process an inquiry."""
@@ -121,11 +220,22 @@ What would you like to know more about?"""
             'can_handle': analysis['can_handle']
         }
         
-        if analysis['can_handle'] and analysis['category']:
-            result['response'] = self.generate_response(analysis['category'])
-        
+        # Escalated or low-confidence inquiries never need a template.
+        # can_handle already implies a matched category.
+        if not analysis['can_handle']:
+            return result
+
+        result['response'] = self.generate_response(analysis['category'])
         return result
 
+    def process_inquiries(self, inquiries):
+        """
+        Process a batch of inquiries (e.g. a backlog of unprocessed ones).
+        Returns one process_inquiry result per inquiry, in the same order.
+        """
+        process = self.process_inquiry
+        return [process(inquiry) for inquiry in inquiries]
+
 
 # Global bot instance
 inquiry_bot = SimpleInquiryBot()
@@ -0,0 +1,126 @@
+"""
+Category choice cache for the Travel App.
+Keeps the (id, name) list of active categories used by category
+dropdowns, so pages that show one do not query the database each time.
+With CACHE_REDIS_URL set, all workers share a version counter in Redis
+and reload their copy when another worker commits a Category change.
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models import db, Category
+
+try:
+    import redis
+except ImportError:  # Only needed when CACHE_REDIS_URL is set
+    redis = None
+
+
+# Cached (version, choices) for active categories; None until first use.
+# The version is the shared Redis counter when CACHE_REDIS_URL is set.
+_category_choices = None
+
+# Redis keys for the category choices shared by all workers
+CATEGORY_VERSION_KEY = "categories:version"
+CATEGORY_DATA_KEY = "categories:data:{}"
+CATEGORY_DATA_TTL = 3600
+
+
+def _category_cache_redis():
+    """Redis client for the shared category cache, or None if not configured."""
+    if "category_cache_redis" not in current_app.extensions:
+        client = None
+        redis_url = current_app.config.get("CACHE_REDIS_URL")
+        if redis_url:
+            if redis is None:
+                raise RuntimeError("CACHE_REDIS_URL is set but redis is not installed")
+            client = redis.Redis.from_url(redis_url)
+        current_app.extensions["category_cache_redis"] = client
+
+    return current_app.extensions["category_cache_redis"]
+
+
+def _query_category_choices():
+    """Query (id, name) choices for active categories, two columns only."""
+    stmt = (
+        select(Category.id, Category.name)
+        .filter_by(is_active=True)
+        .order_by(Category.name)
+    )
+    return [(str(category_id), name) for category_id, name in db.session.execute(stmt)]
+
+
+def _load_shared_choices(client, version):
+    """Get the choices for version from Redis, filling it from the database."""
+    # Data keys carry the version, so a reader that loaded from the
+    # database just before a commit cannot overwrite newer choices
+    key = CATEGORY_DATA_KEY.format(int(version or 0))
+    data = client.get(key)
+    if data is None:
+        choices = _query_category_choices()
+        client.set(key, current_app.json.dumps(choices), ex=CATEGORY_DATA_TTL)
+        return choices
+    return [tuple(choice) for choice in current_app.json.loads(data)]
+
+
+def active_category_choices():
+    """
+    Get (id, name) select choices for all active categories.
+    The result is kept until a Category change is committed. With
+    CACHE_REDIS_URL set, each call checks the shared version counter and
+    reloads from the Redis copy (or the database) when another worker
+    has bumped it. While Redis is unreachable the local copy is used.
+    """
+    global _category_choices
+    client = _category_cache_redis()
+    if client is None:
+        if _category_choices is None:
+            _category_choices = (None, _query_category_choices())
+        return _category_choices[1]
+
+    try:
+        version = client.get(CATEGORY_VERSION_KEY)
+        if _category_choices is None or _category_choices[0] != version:
+            _category_choices = (version, _load_shared_choices(client, version))
+    except redis.RedisError as e:
+        current_app.logger.warning("Category cache Redis unavailable: %s", e)
+        if _category_choices is None:
+            # Kept under no version, so the next reachable check reloads it
+            _category_choices = (None, _query_category_choices())
+
+    return _category_choices[1]
+
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _mark_categories_changed(mapper, connection, target):
+    """Flag the session so the category choices are dropped on commit."""
+    Session.object_session(target).info["categories_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_category_choices(session):
+    """Drop the cached category choices after a Category change commits."""
+    global _category_choices
+    if session.info.pop("categories_changed", False):
+        _category_choices = None
+        # Let the other workers know their copies are out of date
+        client = _category_cache_redis() if has_app_context() else None
+        if client is not None:
+            try:
+                client.incr(CATEGORY_VERSION_KEY)
+            except redis.RedisError as e:
+                # The commit already happened; other workers keep their
+                # copies until the next version bump gets through
+                current_app.logger.warning(
+                    "Could not bump the category cache version: %s", e
+                )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_category_changes(session):
+    """Rolled-back Category changes never reached the database."""
+    session.info.pop("categories_changed", None)
@@ -3,9 +3,50 @@ Decorators for the Travel App.
 This module contains custom decorators for access control and other functionality.
 """
 
+from collections import OrderedDict, deque
 from functools import wraps
-from flask import abort, flash, redirect, url_for, request
+import inspect
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+from flask import abort, current_app, flash, redirect, url_for, request
 from flask_login import current_user
+from sqlalchemy.orm import joinedload
+
+# Flash message and category shown when a login is required
+LOGIN_REQUIRED_MESSAGE = ("Please log in to access this page.", "warning")
+
+# Characters url_for leaves unescaped in query string values
+QUERY_SAFE_CHARS = "!$'()*,/:;?@"
+
+
+def _login_url():
+    """
+    URL of the login page with a next parameter for the current page.
+    Same result as url_for("auth.login", next=request.url), but the login
+    path is built from the URL map once per app instead of on every
+    denied request.
+    """
+    path = current_app.extensions.get("login_path")
+    if path is None:
+        path = current_app.url_map.bind("").build("auth.login")
+        current_app.extensions["login_path"] = path
+
+    query = urlencode({"next": request.url}, safe=QUERY_SAFE_CHARS)
+    return f"{request.script_root}{path}?{query}"
+
+
+def _require_login():
+    """
+    Shared guard for the decorators below.
+    Returns a redirect to the login page for anonymous users, else None.
+    """
+    if current_user.is_authenticated:
+        return None
+
+    flash(*LOGIN_REQUIRED_MESSAGE)
+    return redirect(_login_url())
 
 
 def admin_required(f):
@@ -21,11 +62,12 @@ def admin_required(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
-        if not current_user.is_admin():
+        user = current_user._get_current_object()
+        if not user.is_admin():
             flash("You do not have permission to access this page.", "danger")
             return abort(403)
 
@@ -47,9 +89,9 @@ def user_required(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
         return f(*args, **kwargs)
 
@@ -69,11 +111,12 @@ def active_user_required(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
-        if not current_user.is_active:
+        user = current_user._get_current_object()
+        if not user.is_active:
             flash(
                 "Your account has been deactivated. Please contact support.", "danger"
             )
@@ -120,9 +163,9 @@ def verified_user_required(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
         # Note: Add email_verified field to User model if implementing email verification
         # if not current_user.email_verified:
@@ -147,21 +190,28 @@ def check_booking_ownership(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
         # Get booking_id from kwargs
         booking_id = kwargs.get("booking_id")
         if not booking_id:
             return abort(400)
 
-        from app.models import Booking
+        from app.models import db, Booking
 
-        booking = Booking.query.get_or_404(booking_id)
+        # Load the tour in the same query: booking views always show it,
+        # and the view's own lookup of this booking hits the identity map
+        booking = db.session.get(
+            Booking, booking_id, options=[joinedload(Booking.tour)]
+        )
+        if booking is None:
+            return abort(404)
 
         # Check if user owns the booking or is admin
-        if booking.user_id != current_user.id and not current_user.is_admin():
+        user = current_user._get_current_object()
+        if booking.user_id != user.id and not user.is_admin():
             flash("You do not have permission to access this booking.", "danger")
             return abort(403)
 
@@ -183,21 +233,24 @@ def check_review_ownership(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "warning")
-            return redirect(url_for("auth.login", next=request.url))
+        denied = _require_login()
+        if denied is not None:
+            return denied
 
         # Get review_id from kwargs
         review_id = kwargs.get("review_id")
         if not review_id:
             return abort(400)
 
-        from app.models import Review
+        from app.models import db, Review
 
-        review = Review.query.get_or_404(review_id)
+        review = db.session.get(Review, review_id, options=[joinedload(Review.tour)])
+        if review is None:
+            return abort(404)
 
         # Check if user owns the review or is admin
-        if review.user_id != current_user.id and not current_user.is_admin():
+        user = current_user._get_current_object()
+        if review.user_id != user.id and not user.is_admin():
             flash("You do not have permission to access this review.", "danger")
             return abort(403)
 
@@ -208,8 +261,14 @@ def check_review_ownership(f):
 
 def rate_limit(max_per_minute=60):
     """
-    Simple rate limiting decorator.
-    (For production, use Flask-Limiter instead)
+    Rolling one-minute rate limiting decorator.
+    Requests are counted per endpoint and per user (or client IP for
+    anonymous users). Over the limit, the view is skipped with a 429.
+
+    With RATELIMIT_REDIS_URL configured the window is a Redis sorted set
+    updated by one Lua script, so all workers share the count. Otherwise,
+    and while Redis is unreachable, each process keeps its own window in
+    memory.
 
     Usage:
         @rate_limit(max_per_minute=10)
@@ -220,11 +279,15 @@ def rate_limit(max_per_minute=60):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Simple rate limiting implementation
-            # In production, use Redis or Flask-Limiter
+            user = current_user._get_current_object()
+            if user.is_authenticated:
+                client = f"user:{user.id}"
+            else:
+                client = f"ip:{request.remote_addr}"
+            key = f"rate_limit:{request.endpoint}:{client}"
 
-            # For now, just pass through
-            # TODO: Implement proper rate limiting
+            if not _rate_limit_allow(key, max_per_minute):
+                return abort(429)
 
             return f(*args, **kwargs)
 
@@ -233,31 +296,154 @@ def rate_limit(max_per_minute=60):
     return decorator
 
 
-def validate_json(f):
+# Trim the window, count it, and record this hit in one atomic round-trip.
+# KEYS[1]=window key, ARGV = now_ms, window_ms, limit, unique member
+RATE_LIMIT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[1] .. ':' .. ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+RATE_LIMIT_WINDOW_MS = 60000
+
+# Most client/endpoint windows the in-process fallback keeps at once
+RATE_LIMIT_MAX_KEYS = 10000
+
+# In-process fallback: key -> deque of hit times (ms), least recently
+# hit first
+_rate_limit_windows = OrderedDict()
+_rate_limit_lock = threading.Lock()
+
+
+def _rate_limit_allow(key, limit):
+    """Record a hit for key and report whether it is within the limit."""
+    now_ms = int(time.time() * 1000)
+
+    script = _rate_limit_script()
+    if script is not None:
+        import redis
+
+        try:
+            return bool(
+                script(
+                    keys=[key],
+                    args=[now_ms, RATE_LIMIT_WINDOW_MS, limit, uuid.uuid4().hex],
+                )
+            )
+        except redis.RedisError as e:
+            current_app.logger.warning(
+                "Rate limit Redis unavailable, using in-process window: %s", e
+            )
+
+    cutoff = now_ms - RATE_LIMIT_WINDOW_MS
+    with _rate_limit_lock:
+        window = _rate_limit_windows.get(key)
+        if window is None:
+            window = _rate_limit_windows[key] = deque()
+        else:
+            _rate_limit_windows.move_to_end(key)
+        while window and window[0] <= cutoff:
+            window.popleft()
+
+        allowed = len(window) < limit
+        if allowed:
+            window.append(now_ms)
+
+        # Forget clients whose window has drained, and cap the map size.
+        # key was just moved to the end, so it is never the one dropped.
+        while len(_rate_limit_windows) > 1:
+            oldest_key = next(iter(_rate_limit_windows))
+            oldest = _rate_limit_windows[oldest_key]
+            if len(_rate_limit_windows) <= RATE_LIMIT_MAX_KEYS and (
+                oldest and oldest[-1] > cutoff
+            ):
+                break
+            del _rate_limit_windows[oldest_key]
+
+        return allowed
+
+
+def _rate_limit_script():
+    """
+    Get the app's registered Redis rate limit script, or None when Redis
+    is not configured. The script object runs EVALSHA and reloads the
+    script itself if Redis reports NOSCRIPT.
+    """
+    if "rate_limit_script" not in current_app.extensions:
+        script = None
+        redis_url = current_app.config.get("RATELIMIT_REDIS_URL")
+        if redis_url:
+            import redis
+
+            client = redis.Redis.from_url(redis_url)
+            script = client.register_script(RATE_LIMIT_SCRIPT)
+        current_app.extensions["rate_limit_script"] = script
+
+    return current_app.extensions["rate_limit_script"]
+
+
+# Content types accepted by @validate_json unless a route overrides them
+JSON_MIMETYPES = frozenset({"application/json", "application/vnd.api+json"})
+
+# Largest JSON body accepted by @validate_json unless a route overrides it
+MAX_JSON_BYTES = 64 * 1024
+
+
+def validate_json(f=None, *, max_bytes=MAX_JSON_BYTES, mimetypes=JSON_MIMETYPES):
     """
     Decorator to validate JSON request data.
     For API endpoints.
 
+    Rejects the request before any body parsing when the content type is
+    not an accepted JSON type or the declared body size is too large.
+    Bodies sent without a Content-Length (chunked) are read up to
+    max_bytes and rejected with a 413 if they run past it.
+
     Usage:
         @validate_json
         def api_endpoint():
             pass
+
+        @validate_json(max_bytes=16 * 1024)
+        def small_api_endpoint():
+            pass
     """
 
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not request.is_json:
-            return {"error": "Request must be JSON"}, 400
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.mimetype not in mimetypes:
+                return {"error": "Request must be JSON"}, 400
+
+            content_length = request.content_length
+            if content_length is None:
+                # Chunked body of unknown size: read at most one byte past
+                # the limit, so an oversized body is never read in full
+                request.max_content_length = max_bytes + 1
+                if len(request.get_data(cache=True)) > max_bytes:
+                    return {"error": "Payload too large"}, 413
+            elif content_length > max_bytes:
+                return {"error": "Payload too large"}, 413
 
-        return f(*args, **kwargs)
+            return f(*args, **kwargs)
 
-    return decorated_function
+        return decorated_function
+
+    if f is not None:
+        return decorator(f)
+    return decorator
 
 
 def log_activity(activity_type):
     """
     Decorator to log user activities.
-    (For future activity logging feature)
+    Records go to the travel_app.activity logger, whose file handler runs
+    on a background thread (see logging_config.setup_logging), so the
+    request only pays for queueing the record.
 
     Usage:
         @log_activity('booking_created')
@@ -265,6 +451,9 @@ def log_activity(activity_type):
             pass
     """
 
+    from flask import current_app
+    from app.logging_config import log_user_activity
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -274,17 +463,14 @@ def log_activity(activity_type):
             # Log the activity
             try:
                 if current_user.is_authenticated:
-                    # TODO: Implement activity logging
-                    # ActivityLog.create(
-                    #     user_id=current_user.id,
-                    #     activity_type=activity_type,
-                    #     details=f"Function: {f.__name__}, Args: {args}, Kwargs: {kwargs}"
-                    # )
-                    pass
+                    log_user_activity(
+                        current_app,
+                        activity_type,
+                        user_id=current_user.id,
+                        details=f"Function: {f.__name__}, Kwargs: {kwargs}",
+                    )
             except Exception as e:
                 # Don't fail the main function if logging fails
-                from flask import current_app
-
                 current_app.logger.error(f"Activity logging failed: {str(e)}")
 
             return result
@@ -294,10 +480,18 @@ def log_activity(activity_type):
     return decorator
 
 
-def cache_result(timeout=300):
+def cache_result(timeout=300, maxsize=256, cache_if=None):
     """
-    Simple result caching decorator.
-    (For production, use Flask-Cache or Redis)
+    Result caching decorator.
+    Memoizes results per process, keyed by the call's arguments bound
+    to the function's signature, for up to timeout seconds. At most maxsize results
+    are kept; the least recently used is dropped first. Calls with
+    unhashable arguments are not cached. With cache_if given, only
+    results for which cache_if(result) is true are kept.
+
+    Only use it on functions whose result depends on their arguments
+    alone (not on current_user, request, etc.). Call
+    function.cache_clear() to drop cached results after a change.
 
     Usage:
         @cache_result(timeout=600)
@@ -306,16 +500,46 @@ def cache_result(timeout=300):
     """
 
     def decorator(f):
+        signature = inspect.signature(f)
+        cache = OrderedDict()
+        lock = threading.Lock()
+
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Simple caching implementation
-            # In production, use proper caching solution
+            # Bind to the signature so f(1), f(1, b=1) and f(b=1, a=1)
+            # share one cache entry
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = tuple(bound.arguments.items())
+                hash(key)
+            except TypeError:
+                return f(*args, **kwargs)
+
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return entry[1]
 
-            # For now, just pass through
-            # TODO: Implement proper caching
+            result = f(*args, **kwargs)
+            if cache_if is not None and not cache_if(result):
+                return result
 
-            return f(*args, **kwargs)
+            with lock:
+                cache[key] = (now + timeout, result)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
 
+        decorated_function.cache_clear = cache_clear
         return decorated_function
 
     return decorator
@@ -3,6 +3,8 @@ Forms for the Travel App.
 This module contains all form classes for user input validation.
 """
 
+import re
+from datetime import date
 from flask_wtf import FlaskForm
 from wtforms import (
     StringField,
@@ -17,6 +19,7 @@ from wtforms import (
     HiddenField,
 )
 from wtforms.validators import (
+    AnyOf,
     DataRequired,
     Email,
     EqualTo,
@@ -24,9 +27,267 @@ from wtforms.validators import (
     ValidationError,
     NumberRange,
     Optional,
+    Regexp,
 )
-from wtforms.widgets import TextArea
-from app.models import User, Tour, Category
+from sqlalchemy import case, event, exists, false, func, or_, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+from app.category_cache import active_category_choices
+from app.decorators import cache_result
+from app.models import db, User, Tour, Category
+
+# Rough shape of an email address (one @, no whitespace, a dot in the
+# domain). Every address email-validator accepts matches it.
+EMAIL_SHAPE_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+class FastEmail(Email):
+    """
+    Email validator that rejects obviously malformed input with a
+    precompiled pattern before running the full email-validator check.
+    """
+
+    def __call__(self, form, field):
+        if field.data is None or not EMAIL_SHAPE_RE.fullmatch(field.data):
+            raise ValidationError(
+                self.message or field.gettext("Invalid email address.")
+            )
+        super().__call__(form, field)
+
+
+def strip_filter(value):
+    """WTForms filter: drop surrounding whitespace from submitted text."""
+    return value.strip() if isinstance(value, str) else value
+
+
+def lower_filter(value):
+    """WTForms filter: lowercase submitted text."""
+    return value.lower() if isinstance(value, str) else value
+
+
+# Filters run once when the form is bound, so validators, lookups and
+# views all see the cleaned value. Emails are stored lowercased.
+TEXT_FILTERS = (strip_filter,)
+EMAIL_FILTERS = (strip_filter, lower_filter)
+
+
+def normalize_email(value):
+    """Email in the form it is stored: stripped and lowercased."""
+    return value.strip().lower() if value else value
+
+
+def user_exists(*criteria):
+    """
+    Check whether any user matches the given criteria.
+    Runs an EXISTS query, so no User row is loaded just to test for it.
+    """
+    return db.session.scalar(select(exists().where(*criteria)))
+
+
+def find_user_conflicts(username=None, email=None, exclude_id=None):
+    """
+    Check a username and an email for existing accounts in one query.
+    Values passed as None are not checked. The account with id exclude_id
+    (the user editing their own profile) never counts as a clash.
+
+    Returns:
+        (username_taken, email_taken) tuple of booleans
+    """
+    if username is None and email is None:
+        return False, False
+
+    username_match = User.username == username if username is not None else false()
+    email_match = User.email == email if email is not None else false()
+
+    # The database decides what matches, so a case-insensitive collation
+    # reports the same clashes the unique indexes would
+    stmt = select(
+        func.max(case((username_match, 1), else_=0)),
+        func.max(case((email_match, 1), else_=0)),
+    ).where(or_(username_match, email_match))
+    if exclude_id is not None:
+        stmt = stmt.where(User.id != exclude_id)
+
+    username_taken, email_taken = db.session.execute(stmt).one()
+    return bool(username_taken), bool(email_taken)
+
+
+@cache_result(timeout=60, maxsize=10000, cache_if=bool)
+def email_registered(email):
+    """
+    Check whether an account uses this email address.
+    "Registered" answers are kept for up to a minute so repeated password
+    reset posts for the same address skip the database; a committed User
+    change in this process drops them. "Not registered" is never cached,
+    since a signup handled by another worker would not clear it. Not for
+    ownership or permission checks.
+    """
+    return user_exists(User.email == email)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_delete")
+def _mark_users_changed(mapper, connection, target):
+    """Flag the session so cached email lookups are dropped on commit."""
+    Session.object_session(target).info["user_emails_changed"] = True
+
+
+@event.listens_for(User, "after_update")
+def _mark_user_email_changed(mapper, connection, target):
+    """Only an email change affects the cached lookups."""
+    if sa_inspect(target).attrs.email.history.has_changes():
+        Session.object_session(target).info["user_emails_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_email_lookups(session):
+    """Drop cached email lookups after a User change commits."""
+    if session.info.pop("user_emails_changed", False):
+        email_registered.cache_clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    """Rolled-back User changes never reached the database."""
+    session.info.pop("user_emails_changed", None)
+
+
+def optional_int(value):
+    """SelectField coerce: int id, or None for the empty choice."""
+    return int(value) if value else None
+
+
+# Validator instances shared by several form fields. WTForms validators
+# keep no per-field state, so one instance can back every field that
+# applies the same rule with the same message.
+OPTIONAL = Optional()
+REQUIRED = DataRequired()
+FIRST_NAME_REQUIRED = DataRequired(message="First name is required")
+FIRST_NAME_LENGTH = Length(
+    min=2, max=50, message="First name must be between 2 and 50 characters"
+)
+LAST_NAME_REQUIRED = DataRequired(message="Last name is required")
+LAST_NAME_LENGTH = Length(
+    min=2, max=50, message="Last name must be between 2 and 50 characters"
+)
+USERNAME_REQUIRED = DataRequired(message="Username is required")
+EMAIL_REQUIRED = DataRequired(message="Email is required")
+EMAIL_FORMAT = FastEmail(message="Please enter a valid email address")
+EMAIL_LENGTH = Length(max=120, message="Email must be less than 120 characters")
+PHONE_LENGTH = Length(max=20, message="Phone number must be less than 20 characters")
+PHONE_FORMAT = Regexp(
+    r"\A[+0-9()\s.-]*\Z",
+    message="Phone number may only contain digits, spaces and + ( ) . -",
+)
+USERNAME_FORMAT = Regexp(
+    r"\A[A-Za-z0-9_.-]+\Z",
+    message="Username may only contain letters, numbers and _ . -",
+)
+PASSWORD_REQUIRED = DataRequired(message="Password is required")
+PASSWORD_LENGTH = Length(min=8, message="Password must be at least 8 characters long")
+PASSWORD_CONFIRM_REQUIRED = DataRequired(message="Please confirm your password")
+PASSWORDS_MATCH = EqualTo("password", message="Passwords must match")
+LENGTH_MAX_2000 = Length(max=2000)
+PRICE_RANGE = NumberRange(min=0, message="Price must be positive")
+PARTICIPANTS_REQUIRED = DataRequired(message="Number of participants is required")
+PARTICIPANTS_RANGE = NumberRange(
+    min=1, max=50, message="Participants must be between 1 and 50"
+)
+TOUR_DATE_REQUIRED = DataRequired(message="Tour date is required")
+CONTACT_PHONE_REQUIRED = DataRequired(message="Contact phone is required")
+EMERGENCY_CONTACT_LENGTH = Length(
+    max=100, message="Emergency contact must be less than 100 characters"
+)
+SPECIAL_REQUESTS_LENGTH = Length(
+    max=500, message="Special requests must be less than 500 characters"
+)
+
+# Fixed select choices, built once at import
+ALL_CATEGORIES_CHOICE = ("", "All Categories")
+
+DURATION_CHOICES = (
+    ("", "Any Duration"),
+    ("1", "1 Day"),
+    ("2-3", "2-3 Days"),
+    ("4-7", "4-7 Days"),
+    ("8+", "8+ Days"),
+)
+
+DIFFICULTY_CHOICES = (
+    ("", "Any Difficulty"),
+    ("Easy", "Easy"),
+    ("Medium", "Medium"),
+    ("Hard", "Hard"),
+)
+
+INQUIRY_TYPE_CHOICES = (
+    ("general", "General Inquiry"),
+    ("booking", "Booking Question"),
+    ("complaint", "Complaint"),
+    ("suggestion", "Suggestion"),
+)
+
+INQUIRY_STATUS_CHOICES = (
+    ("new", "New"),
+    ("in_progress", "In Progress"),
+    ("resolved", "Resolved"),
+    ("closed", "Closed"),
+)
+
+INQUIRY_PRIORITY_CHOICES = (
+    ("low", "Low"),
+    ("medium", "Medium"),
+    ("high", "High"),
+    ("urgent", "Urgent"),
+)
+
+# Admin inquiry filters: an "all" option followed by the values above
+STATUS_FILTER_CHOICES = (("", "All Statuses"),) + INQUIRY_STATUS_CHOICES
+PRIORITY_FILTER_CHOICES = (("", "All Priorities"),) + INQUIRY_PRIORITY_CHOICES
+TYPE_FILTER_CHOICES = (
+    ("", "All Types"),
+    ("general", "General"),
+    ("booking", "Booking"),
+    ("complaint", "Complaint"),
+    ("suggestion", "Suggestion"),
+)
+
+BOT_CATEGORY_CHOICES = (
+    ("general", "General"),
+    ("booking", "Booking"),
+    ("pricing", "Pricing"),
+    ("cancellation", "Cancellation"),
+    ("location", "Location"),
+    ("duration", "Duration"),
+    ("requirements", "Requirements"),
+)
+
+
+def choice_values(choices):
+    """Set of the submitted values allowed by a fixed choices tuple."""
+    return frozenset(value for value, _label in choices)
+
+
+# Fixed-choice filter fields check membership in a frozenset instead of
+# WTForms walking the choices list (validate_choice=False on the field).
+# The message matches SelectField's own.
+INVALID_CHOICE = "Not a valid choice."
+DURATION_CHOICE = AnyOf(choice_values(DURATION_CHOICES), message=INVALID_CHOICE)
+DIFFICULTY_CHOICE = AnyOf(choice_values(DIFFICULTY_CHOICES), message=INVALID_CHOICE)
+STATUS_FILTER_CHOICE = AnyOf(
+    choice_values(STATUS_FILTER_CHOICES), message=INVALID_CHOICE
+)
+PRIORITY_FILTER_CHOICE = AnyOf(
+    choice_values(PRIORITY_FILTER_CHOICES), message=INVALID_CHOICE
+)
+TYPE_FILTER_CHOICE = AnyOf(
+    choice_values(TYPE_FILTER_CHOICES), message=INVALID_CHOICE
+)
+
+
+def search_category_choices():
+    """Category choices for the tour search form, with an 'all' option."""
+    return [ALL_CATEGORIES_CHOICE, *active_category_choices()]
 
 
 class RegistrationForm(FlaskForm):
@@ -38,49 +299,52 @@ class RegistrationForm(FlaskForm):
     # Personal Information
     first_name = StringField(
         "First Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="First name is required"),
-            Length(
-                min=2, max=50, message="First name must be between 2 and 50 characters"
-            ),
+            FIRST_NAME_REQUIRED,
+            FIRST_NAME_LENGTH,
         ],
     )
 
     last_name = StringField(
         "Last Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Last name is required"),
-            Length(
-                min=2, max=50, message="Last name must be between 2 and 50 characters"
-            ),
+            LAST_NAME_REQUIRED,
+            LAST_NAME_LENGTH,
         ],
     )
 
     # Account Information
     username = StringField(
         "Username",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Username is required"),
+            USERNAME_REQUIRED,
             Length(
                 min=4, max=20, message="Username must be between 4 and 20 characters"
             ),
+            USERNAME_FORMAT,
         ],
     )
 
     email = StringField(
         "Email",
+        filters=EMAIL_FILTERS,
         validators=[
-            DataRequired(message="Email is required"),
-            Email(message="Please enter a valid email address"),
-            Length(max=120, message="Email must be less than 120 characters"),
+            EMAIL_REQUIRED,
+            EMAIL_FORMAT,
+            EMAIL_LENGTH,
         ],
     )
 
     phone = StringField(
         "Phone Number",
+        filters=TEXT_FILTERS,
         validators=[
-            Optional(),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            OPTIONAL,
+            PHONE_LENGTH,
+            PHONE_FORMAT,
         ],
     )
 
@@ -88,16 +352,16 @@ class RegistrationForm(FlaskForm):
     password = PasswordField(
         "Password",
         validators=[
-            DataRequired(message="Password is required"),
-            Length(min=8, message="Password must be at least 8 characters long"),
+            PASSWORD_REQUIRED,
+            PASSWORD_LENGTH,
         ],
     )
 
     password2 = PasswordField(
         "Confirm Password",
         validators=[
-            DataRequired(message="Please confirm your password"),
-            EqualTo("password", message="Passwords must match"),
+            PASSWORD_CONFIRM_REQUIRED,
+            PASSWORDS_MATCH,
         ],
     )
 
@@ -109,18 +373,33 @@ class RegistrationForm(FlaskForm):
 
     submit = SubmitField("Register")
 
+    def __init__(self, *args, **kwargs):
+        super(RegistrationForm, self).__init__(*args, **kwargs)
+        self._conflicts = None
+
+    def _user_conflicts(self):
+        """Look up username and email clashes once for both validators"""
+        if self._conflicts is None:
+            # Values that already failed their own validators are not looked up
+            self._conflicts = find_user_conflicts(
+                None if self.username.errors else self.username.data,
+                None if self.email.errors else self.email.data,
+            )
+        return self._conflicts
+
     def validate_username(self, username):
         """Check if username is already taken"""
-        user = User.query.filter_by(username=username.data).first()
-        if user:
+        if username.errors:
+            return
+
+        if self._user_conflicts()[0]:
             raise ValidationError(
                 "Username already exists. Please choose a different one."
             )
 
     def validate_email(self, email):
         """Check if email is already registered"""
-        user = User.query.filter_by(email=email.data).first()
-        if user:
+        if self._user_conflicts()[1]:
             raise ValidationError(
                 "Email already registered. Please use a different email or login."
             )
@@ -134,15 +413,14 @@ class LoginForm(FlaskForm):
 
     username_or_email = StringField(
         "Username or Email",
+        filters=TEXT_FILTERS,
         validators=[
             DataRequired(message="Username or email is required"),
             Length(max=120, message="Input too long"),
         ],
     )
 
-    password = PasswordField(
-        "Password", validators=[DataRequired(message="Password is required")]
-    )
+    password = PasswordField("Password", validators=[PASSWORD_REQUIRED])
 
     remember_me = BooleanField("Remember Me")
     submit = SubmitField("Login")
@@ -156,9 +434,11 @@ class ForgotPasswordForm(FlaskForm):
 
     email = StringField(
         "Email",
+        filters=EMAIL_FILTERS,
         validators=[
-            DataRequired(message="Email is required"),
-            Email(message="Please enter a valid email address"),
+            EMAIL_REQUIRED,
+            EMAIL_FORMAT,
+            EMAIL_LENGTH,
         ],
     )
 
@@ -166,8 +446,7 @@ class ForgotPasswordForm(FlaskForm):
 
     def validate_email(self, email):
         """Check if email exists in database"""
-        user = User.query.filter_by(email=email.data).first()
-        if not user:
+        if not email_registered(email.data):
             raise ValidationError("No account found with that email address.")
 
 
@@ -180,52 +459,22 @@ class ResetPasswordForm(FlaskForm):
     password = PasswordField(
         "New Password",
         validators=[
-            DataRequired(message="Password is required"),
-            Length(min=8, message="Password must be at least 8 characters long"),
+            PASSWORD_REQUIRED,
+            PASSWORD_LENGTH,
         ],
     )
 
     password2 = PasswordField(
         "Confirm New Password",
         validators=[
-            DataRequired(message="Please confirm your password"),
-            EqualTo("password", message="Passwords must match"),
+            PASSWORD_CONFIRM_REQUIRED,
+            PASSWORDS_MATCH,
         ],
     )
 
     submit = SubmitField("Reset Password")
 
 
-class ChangePasswordForm(FlaskForm):
-    """
-    Change password form for logged-in users.
-    Handles password updates.
-    """
-
-    current_password = PasswordField(
-        "Current Password",
-        validators=[DataRequired(message="Current password is required")],
-    )
-
-    new_password = PasswordField(
-        "New Password",
-        validators=[
-            DataRequired(message="New password is required"),
-            Length(min=8, message="Password must be at least 8 characters long"),
-        ],
-    )
-
-    new_password2 = PasswordField(
-        "Confirm New Password",
-        validators=[
-            DataRequired(message="Please confirm your new password"),
-            EqualTo("new_password", message="Passwords must match"),
-        ],
-    )
-
-    submit = SubmitField("Change Password")
-
-
 class ProfileUpdateForm(FlaskForm):
     """
     Profile update form.
@@ -234,56 +483,66 @@ class ProfileUpdateForm(FlaskForm):
 
     first_name = StringField(
         "First Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="First name is required"),
-            Length(
-                min=2, max=50, message="First name must be between 2 and 50 characters"
-            ),
+            FIRST_NAME_REQUIRED,
+            FIRST_NAME_LENGTH,
         ],
     )
 
     last_name = StringField(
         "Last Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Last name is required"),
-            Length(
-                min=2, max=50, message="Last name must be between 2 and 50 characters"
-            ),
+            LAST_NAME_REQUIRED,
+            LAST_NAME_LENGTH,
         ],
     )
 
     email = StringField(
         "Email",
+        filters=EMAIL_FILTERS,
         validators=[
-            DataRequired(message="Email is required"),
-            Email(message="Please enter a valid email address"),
-            Length(max=120, message="Email must be less than 120 characters"),
+            EMAIL_REQUIRED,
+            EMAIL_FORMAT,
+            EMAIL_LENGTH,
         ],
     )
 
     phone = StringField(
         "Phone Number",
+        filters=TEXT_FILTERS,
         validators=[
-            Optional(),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            OPTIONAL,
+            PHONE_LENGTH,
         ],
     )
 
     submit = SubmitField("Update Profile")
 
-    def __init__(self, original_email, *args, **kwargs):
-        """Initialize with current user's email to avoid validation error"""
+    def __init__(self, original_user, *args, **kwargs):
+        """Initialize with the user being edited to avoid validation error"""
         super(ProfileUpdateForm, self).__init__(*args, **kwargs)
-        self.original_email = original_email
+        self.original_id = original_user.id
+        self.original_email = normalize_email(original_user.email)
+        self.original_phone = original_user.phone
+
+    def validate_phone(self, phone):
+        """Check the phone format only when it changed"""
+        if phone.data == self.original_phone or phone.errors:
+            return
+
+        PHONE_FORMAT(self, phone)
 
     def validate_email(self, email):
         """Check if email is already taken by another user"""
-        if email.data != self.original_email:
-            user = User.query.filter_by(email=email.data).first()
-            if user:
-                raise ValidationError(
-                    "Email already registered. Please use a different email."
-                )
+        if email.data == self.original_email:
+            return
+
+        if user_exists(User.email == email.data, User.id != self.original_id):
+            raise ValidationError(
+                "Email already registered. Please use a different email."
+            )
 
 
 class ContactForm(FlaskForm):
@@ -294,6 +553,7 @@ class ContactForm(FlaskForm):
 
     name = StringField(
         "Full Name",
+        filters=TEXT_FILTERS,
         validators=[
             DataRequired(message="Name is required"),
             Length(min=2, max=100, message="Name must be between 2 and 100 characters"),
@@ -302,22 +562,27 @@ class ContactForm(FlaskForm):
 
     email = StringField(
         "Email",
+        filters=EMAIL_FILTERS,
         validators=[
-            DataRequired(message="Email is required"),
-            Email(message="Please enter a valid email address"),
+            EMAIL_REQUIRED,
+            EMAIL_FORMAT,
+            EMAIL_LENGTH,
         ],
     )
 
     phone = StringField(
         "Phone Number",
+        filters=TEXT_FILTERS,
         validators=[
-            Optional(),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            OPTIONAL,
+            PHONE_LENGTH,
+            PHONE_FORMAT,
         ],
     )
 
     subject = StringField(
         "Subject",
+        filters=TEXT_FILTERS,
         validators=[
             DataRequired(message="Subject is required"),
             Length(
@@ -328,13 +593,8 @@ class ContactForm(FlaskForm):
 
     inquiry_type = SelectField(
         "Inquiry Type",
-        choices=[
-            ("general", "General Inquiry"),
-            ("booking", "Booking Question"),
-            ("complaint", "Complaint"),
-            ("suggestion", "Suggestion"),
-        ],
-        validators=[DataRequired()],
+        choices=INQUIRY_TYPE_CHOICES,
+        validators=[REQUIRED],
     )
 
     message = TextAreaField(
@@ -358,61 +618,50 @@ class TourSearchForm(FlaskForm):
     Handles tour searching and filtering.
     """
 
+    class Meta:
+        # Submitted with GET and changes nothing, so no CSRF token is
+        # generated or checked
+        csrf = False
+
     search_query = StringField(
         "Search Tours",
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=200, message="Search query must be less than 200 characters"),
         ],
     )
 
+    # Called by WTForms each time the form is created
     category = SelectField(
-        "Category", choices=[("", "All Categories")], validators=[Optional()]
+        "Category", choices=search_category_choices, validators=[OPTIONAL]
     )
 
     min_price = FloatField(
         "Min Price",
-        validators=[Optional(), NumberRange(min=0, message="Price must be positive")],
+        validators=[OPTIONAL, PRICE_RANGE],
     )
 
     max_price = FloatField(
         "Max Price",
-        validators=[Optional(), NumberRange(min=0, message="Price must be positive")],
+        validators=[OPTIONAL, PRICE_RANGE],
     )
 
     duration = SelectField(
         "Duration",
-        choices=[
-            ("", "Any Duration"),
-            ("1", "1 Day"),
-            ("2-3", "2-3 Days"),
-            ("4-7", "4-7 Days"),
-            ("8+", "8+ Days"),
-        ],
-        validators=[Optional()],
+        choices=DURATION_CHOICES,
+        validate_choice=False,
+        validators=[OPTIONAL, DURATION_CHOICE],
     )
 
     difficulty = SelectField(
         "Difficulty",
-        choices=[
-            ("", "Any Difficulty"),
-            ("Easy", "Easy"),
-            ("Medium", "Medium"),
-            ("Hard", "Hard"),
-        ],
-        validators=[Optional()],
+        choices=DIFFICULTY_CHOICES,
+        validate_choice=False,
+        validators=[OPTIONAL, DIFFICULTY_CHOICE],
     )
 
     submit = SubmitField("Search")
 
-    def __init__(self, *args, **kwargs):
-        """Initialize with dynamic category choices"""
-        super(TourSearchForm, self).__init__(*args, **kwargs)
-        self.category.choices = [("", "All Categories")] + [
-            (str(cat.id), cat.name)
-            for cat in Category.query.filter_by(is_active=True).all()
-        ]
-
 
 class BookingForm(FlaskForm):
     """
@@ -431,33 +680,33 @@ class BookingForm(FlaskForm):
     participants = IntegerField(
         "Number of Participants",
         validators=[
-            DataRequired(message="Number of participants is required"),
-            NumberRange(min=1, max=50, message="Participants must be between 1 and 50"),
+            PARTICIPANTS_REQUIRED,
+            PARTICIPANTS_RANGE,
         ],
         default=1,
     )
 
     booking_date = DateField(
         "Preferred Tour Date",
-        validators=[DataRequired(message="Tour date is required")],
+        validators=[TOUR_DATE_REQUIRED],
     )
 
     # Contact Information
     contact_phone = StringField(
         "Contact Phone",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Contact phone is required"),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            CONTACT_PHONE_REQUIRED,
+            PHONE_LENGTH,
+            PHONE_FORMAT,
         ],
     )
 
     emergency_contact = StringField(
         "Emergency Contact",
         validators=[
-            Optional(),
-            Length(
-                max=100, message="Emergency contact must be less than 100 characters"
-            ),
+            OPTIONAL,
+            EMERGENCY_CONTACT_LENGTH,
         ],
     )
 
@@ -465,10 +714,8 @@ class BookingForm(FlaskForm):
     special_requests = TextAreaField(
         "Special Requests",
         validators=[
-            Optional(),
-            Length(
-                max=500, message="Special requests must be less than 500 characters"
-            ),
+            OPTIONAL,
+            SPECIAL_REQUESTS_LENGTH,
         ],
         render_kw={
             "rows": 3,
@@ -488,8 +735,6 @@ class BookingForm(FlaskForm):
 
     def validate_booking_date(self, booking_date):
         """Check if booking date is in the future"""
-        from datetime import date
-
         if booking_date.data <= date.today():
             raise ValidationError("Booking date must be in the future")
 
@@ -503,51 +748,59 @@ class BookingUpdateForm(FlaskForm):
     participants = IntegerField(
         "Number of Participants",
         validators=[
-            DataRequired(message="Number of participants is required"),
-            NumberRange(min=1, max=50, message="Participants must be between 1 and 50"),
+            PARTICIPANTS_REQUIRED,
+            PARTICIPANTS_RANGE,
         ],
     )
 
     booking_date = DateField(
         "Preferred Tour Date",
-        validators=[DataRequired(message="Tour date is required")],
+        validators=[TOUR_DATE_REQUIRED],
     )
 
     contact_phone = StringField(
         "Contact Phone",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Contact phone is required"),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            CONTACT_PHONE_REQUIRED,
+            PHONE_LENGTH,
         ],
     )
 
     emergency_contact = StringField(
         "Emergency Contact",
         validators=[
-            Optional(),
-            Length(
-                max=100, message="Emergency contact must be less than 100 characters"
-            ),
+            OPTIONAL,
+            EMERGENCY_CONTACT_LENGTH,
         ],
     )
 
     special_requests = TextAreaField(
         "Special Requests",
         validators=[
-            Optional(),
-            Length(
-                max=500, message="Special requests must be less than 500 characters"
-            ),
+            OPTIONAL,
+            SPECIAL_REQUESTS_LENGTH,
         ],
         render_kw={"rows": 3},
     )
 
     submit = SubmitField("Update Booking")
 
+    def __init__(self, *args, **kwargs):
+        """Remember the stored contact phone of the booking being edited"""
+        super(BookingUpdateForm, self).__init__(*args, **kwargs)
+        obj = kwargs.get("obj")
+        self.original_contact_phone = obj.contact_phone if obj is not None else None
+
+    def validate_contact_phone(self, contact_phone):
+        """Check the phone format only when it changed"""
+        if contact_phone.data == self.original_contact_phone or contact_phone.errors:
+            return
+
+        PHONE_FORMAT(self, contact_phone)
+
     def validate_booking_date(self, booking_date):
         """Check if booking date is in the future"""
-        from datetime import date
-
         if booking_date.data <= date.today():
             raise ValidationError("Booking date must be in the future")
 
@@ -560,7 +813,7 @@ class BookingCancelForm(FlaskForm):
     cancel_reason = TextAreaField(
         "Reason for Cancellation (Optional)",
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=250, message="Reason must be less than 250 characters"),
         ],
         render_kw={
@@ -589,28 +842,27 @@ class EditProfileForm(FlaskForm):
     # Personal Information
     first_name = StringField(
         "First Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="First name is required"),
-            Length(
-                min=2, max=50, message="First name must be between 2 and 50 characters"
-            ),
+            FIRST_NAME_REQUIRED,
+            FIRST_NAME_LENGTH,
         ],
     )
 
     last_name = StringField(
         "Last Name",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Last name is required"),
-            Length(
-                min=2, max=50, message="Last name must be between 2 and 50 characters"
-            ),
+            LAST_NAME_REQUIRED,
+            LAST_NAME_LENGTH,
         ],
     )
 
     username = StringField(
         "Username",
+        filters=TEXT_FILTERS,
         validators=[
-            DataRequired(message="Username is required"),
+            USERNAME_REQUIRED,
             Length(
                 min=4, max=25, message="Username must be between 4 and 25 characters"
             ),
@@ -619,24 +871,27 @@ class EditProfileForm(FlaskForm):
 
     email = StringField(
         "Email",
+        filters=EMAIL_FILTERS,
         validators=[
-            DataRequired(message="Email is required"),
-            Email(message="Please enter a valid email address"),
+            EMAIL_REQUIRED,
+            EMAIL_FORMAT,
+            EMAIL_LENGTH,
         ],
     )
 
     phone = StringField(
         "Phone Number",
+        filters=TEXT_FILTERS,
         validators=[
-            Optional(),
-            Length(max=20, message="Phone number must be less than 20 characters"),
+            OPTIONAL,
+            PHONE_LENGTH,
         ],
     )
 
     bio = TextAreaField(
         "Bio",
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=500, message="Bio must be less than 500 characters"),
         ],
         render_kw={
@@ -647,28 +902,63 @@ class EditProfileForm(FlaskForm):
 
     submit = SubmitField("Update Profile")
 
-    def __init__(self, original_username, original_email, *args, **kwargs):
+    def __init__(self, original_user, *args, **kwargs):
+        """Initialize with the user being edited (usually current_user)"""
         super(EditProfileForm, self).__init__(*args, **kwargs)
-        self.original_username = original_username
-        self.original_email = original_email
+        self.original_id = original_user.id
+        self.original_username = original_user.username
+        self.original_email = normalize_email(original_user.email)
+        self.original_phone = original_user.phone
+        self._conflicts = None
+
+    def _user_conflicts(self):
+        """Look up clashes for the changed username and email in one query"""
+        if self._conflicts is None:
+            username = self.username.data
+            email = self.email.data
+            changed_username = (
+                username != self.original_username and not self.username.errors
+            )
+            changed_email = email != self.original_email and not self.email.errors
+            self._conflicts = find_user_conflicts(
+                username if changed_username else None,
+                email if changed_email else None,
+                exclude_id=self.original_id,
+            )
+        return self._conflicts
 
     def validate_username(self, username):
         """Check if username is already taken by another user"""
-        if username.data != self.original_username:
-            user = User.query.filter_by(username=username.data).first()
-            if user:
-                raise ValidationError(
-                    "Username already taken. Please choose a different one."
-                )
+        if username.data == self.original_username or username.errors:
+            return
+
+        # Checked here rather than in the field's validators so existing
+        # usernames from before the rule can still be saved unchanged
+        USERNAME_FORMAT(self, username)
+
+        if self._user_conflicts()[0]:
+            raise ValidationError(
+                "Username already taken. Please choose a different one."
+            )
+
+    def validate_phone(self, phone):
+        """Check the phone format only when it changed"""
+        # Same reason as the username check: older numbers such as
+        # "0705 908 699 ext 2" must still save unchanged
+        if phone.data == self.original_phone or phone.errors:
+            return
+
+        PHONE_FORMAT(self, phone)
 
     def validate_email(self, email):
         """Check if email is already registered by another user"""
-        if email.data != self.original_email:
-            user = User.query.filter_by(email=email.data).first()
-            if user:
-                raise ValidationError(
-                    "Email already registered. Please choose a different one."
-                )
+        if email.data == self.original_email:
+            return
+
+        if self._user_conflicts()[1]:
+            raise ValidationError(
+                "Email already registered. Please choose a different one."
+            )
 
 
 class ChangePasswordForm(FlaskForm):
@@ -686,7 +976,7 @@ class ChangePasswordForm(FlaskForm):
         "New Password",
         validators=[
             DataRequired(message="New password is required"),
-            Length(min=8, message="Password must be at least 8 characters long"),
+            PASSWORD_LENGTH,
         ],
     )
 
@@ -709,14 +999,13 @@ class ReviewForm(FlaskForm):
     rating = IntegerField(
         "Rating (1-5)",
         validators=[
-            DataRequired(),
+            REQUIRED,
             NumberRange(min=1, max=5, message="Rating must be between 1 and 5"),
         ],
     )
     comment = TextAreaField(
         "Comment",
-        validators=[DataRequired(), Length(max=2000)],
-        widget=TextArea(),
+        validators=[REQUIRED, LENGTH_MAX_2000],
     )
     submit = SubmitField("Submit Review")
 
@@ -727,7 +1016,7 @@ class TourCompleteForm(FlaskForm):
     Form for admin to mark a tour as completed.
     """
 
-    tour_id = HiddenField("Tour ID", validators=[DataRequired()])
+    tour_id = HiddenField("Tour ID", validators=[REQUIRED])
     submit = SubmitField("Mark as Completed")
 
 
@@ -740,32 +1029,20 @@ class InquiryResponseForm(FlaskForm):
     response = TextAreaField(
         "Response",
         validators=[Length(max=5000)],
-        widget=TextArea(),
     )
     internal_notes = TextAreaField(
         "Internal Notes (Admin Only)",
-        validators=[Length(max=2000)],
-        widget=TextArea(),
+        validators=[LENGTH_MAX_2000],
     )
     status = SelectField(
         "Status",
-        choices=[
-            ("new", "New"),
-            ("in_progress", "In Progress"),
-            ("resolved", "Resolved"),
-            ("closed", "Closed"),
-        ],
-        validators=[DataRequired()],
+        choices=INQUIRY_STATUS_CHOICES,
+        validators=[REQUIRED],
     )
     priority = SelectField(
         "Priority",
-        choices=[
-            ("low", "Low"),
-            ("medium", "Medium"),
-            ("high", "High"),
-            ("urgent", "Urgent"),
-        ],
-        validators=[DataRequired()],
+        choices=INQUIRY_PRIORITY_CHOICES,
+        validators=[REQUIRED],
     )
     send_email = BooleanField("Send Email Response", default=True)
     submit = SubmitField("Update Inquiry")
@@ -778,8 +1055,8 @@ class InquiryAssignForm(FlaskForm):
 
     assigned_to_id = SelectField(
         "Assign To",
-        coerce=lambda x: int(x) if x else None,
-        validators=[Optional()],
+        coerce=optional_int,
+        validators=[OPTIONAL],
     )
     submit = SubmitField("Assign")
 
@@ -789,42 +1066,35 @@ class InquiryFilterForm(FlaskForm):
     Form for filtering inquiries in admin panel.
     """
 
+    class Meta:
+        # Submitted with GET and changes nothing, so no CSRF token is
+        # generated or checked
+        csrf = False
+
     status = SelectField(
         "Status",
-        choices=[
-            ("", "All Statuses"),
-            ("new", "New"),
-            ("in_progress", "In Progress"),
-            ("resolved", "Resolved"),
-            ("closed", "Closed"),
-        ],
+        choices=STATUS_FILTER_CHOICES,
+        validate_choice=False,
+        validators=[STATUS_FILTER_CHOICE],
         default="",
     )
     priority = SelectField(
         "Priority",
-        choices=[
-            ("", "All Priorities"),
-            ("low", "Low"),
-            ("medium", "Medium"),
-            ("high", "High"),
-            ("urgent", "Urgent"),
-        ],
+        choices=PRIORITY_FILTER_CHOICES,
+        validate_choice=False,
+        validators=[PRIORITY_FILTER_CHOICE],
         default="",
     )
     inquiry_type = SelectField(
         "Type",
-        choices=[
-            ("", "All Types"),
-            ("general", "General"),
-            ("booking", "Booking"),
-            ("complaint", "Complaint"),
-            ("suggestion", "Suggestion"),
-        ],
+        choices=TYPE_FILTER_CHOICES,
+        validate_choice=False,
+        validators=[TYPE_FILTER_CHOICE],
         default="",
     )
     assigned_to_id = SelectField(
         "Assigned To",
-        coerce=lambda x: int(x) if x else None,
+        coerce=optional_int,
         choices=[],
         default=None,
     )
@@ -840,15 +1110,7 @@ class BotResponseForm(FlaskForm):
     
     category = SelectField(
         "Category",
-        choices=[
-            ("general", "General"),
-            ("booking", "Booking"),
-            ("pricing", "Pricing"),
-            ("cancellation", "Cancellation"),
-            ("location", "Location"),
-            ("duration", "Duration"),
-            ("requirements", "Requirements"),
-        ],
+        choices=BOT_CATEGORY_CHOICES,
         validators=[DataRequired(message="Please select a category")],
     )
     
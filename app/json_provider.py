@@ -0,0 +1,70 @@
+"""
+JSON provider for the Travel App.
+Uses orjson for request parsing and response serialization when it is
+installed, and falls back to Flask's default provider otherwise.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Keep Flask's stdlib json provider
+    orjson = None
+
+
+# Separators Flask passes for compact (non-debug) responses; orjson output
+# is already compact, so these are the only dumps() options it can honour
+COMPACT_SEPARATORS = (",", ":")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    orjson always writes UTF-8, so ensure_ascii is off here; non-ASCII
+    text is sent as is instead of as \\u escapes.
+    Dates, dataclasses and other types orjson would format differently
+    are passed through to Flask's default() so output stays the same.
+    Calls with options orjson does not support (e.g. indent in debug mode)
+    use the stdlib implementation.
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string."""
+        if self.ensure_ascii:
+            # Set back on by the app; only the stdlib can escape
+            return super().dumps(obj, **kwargs)
+        if kwargs and kwargs != {"separators": COMPACT_SEPARATORS}:
+            return super().dumps(obj, **kwargs)
+
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def setup_json_provider(app):
+    """
+    Switch the app to the orjson provider when orjson is available.
+    request.get_json() and jsonify() both go through app.json.
+    """
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+    return app
@@ -3,12 +3,120 @@ Logging configuration for the Travel App.
 Provides comprehensive error and exception logging for maintenance.
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-from flask import request, g
+import queue
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
+from flask import g, render_template, request
+from flask_login import current_user
 import time
 
+from app.models import db
+
+
+# Longest error text written to the logs; longer messages are truncated
+MAX_ERROR_MESSAGE_LENGTH = 2048
+
+# Most records waiting for a log writer thread
+LOG_QUEUE_SIZE = 10000
+
+
+class SizeRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that checks the size before the file type.
+    The stdlib handler (before Python 3.12) calls os.path.exists and
+    os.path.isfile on every record; here they only run when a rollover
+    is actually due.
+    """
+
+    def shouldRollover(self, record):
+        """Check whether the record would push the file past maxBytes."""
+        if self.stream is None:  # delay was set
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(msg) >= self.maxBytes:
+                # Never roll over anything other than a regular file (bpo-45401)
+                return not (
+                    os.path.exists(self.baseFilename)
+                    and not os.path.isfile(self.baseFilename)
+                )
+        return False
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose stop waits for room in a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Hand records to another handler through a bounded queue drained by a
+    background thread, so the logging call only pays for the put.
+    The thread is started on the first record logged in each process: a
+    worker forked from a preloaded master gets its own queue and thread
+    instead of inheriting a queue that nothing drains.
+    """
+
+    def __init__(self, handler, maxsize=LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.setLevel(handler.level)
+        self.handler = handler
+        self.maxsize = maxsize
+        self.listener = None
+        self._pid = None
+
+    def _start_listener(self):
+        """Start the queue listener if this process has none yet."""
+        if self._pid is not None:
+            # Forked: the parent's thread did not come along, and records
+            # it left buffered are still written by the parent
+            self.queue = queue.Queue(self.maxsize)
+            if isinstance(self.handler, MemoryHandler):
+                self.handler.acquire()
+                try:
+                    self.handler.buffer.clear()
+                finally:
+                    self.handler.release()
+
+        self.listener = _DrainingQueueListener(
+            self.queue, self.handler, respect_handler_level=True
+        )
+        self.listener.start()
+        self._pid = os.getpid()
+        atexit.register(self._stop_listener, self.listener, self._pid)
+
+    @staticmethod
+    def _stop_listener(listener, pid):
+        """Stop a listener at exit, unless it belongs to a parent process."""
+        if os.getpid() == pid:
+            listener.stop()
+
+    def emit(self, record):
+        # Runs under the handler lock, so only one thread starts the listener
+        if self._pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def enqueue(self, record):
+        """Queue the record; below ERROR it is dropped if the queue is full."""
+        if record.levelno >= logging.ERROR:
+            self.queue.put(record)
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
 
 def setup_logging(app):
     """
@@ -27,38 +135,73 @@ def setup_logging(app):
         log_level = logging.INFO
     
     # Main application log file with rotation
-    file_handler = RotatingFileHandler(
+    file_handler = SizeRotatingFileHandler(
         'logs/travel_app.log', 
-        maxBytes=10240000,  # 10MB
+        maxBytes=64 * 1024 * 1024,  # 64MB
         backupCount=10
     )
     file_handler.setFormatter(logging.Formatter(
         '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
     ))
     file_handler.setLevel(log_level)
-    app.logger.addHandler(file_handler)
-    
-    # Error-specific log file
-    error_handler = RotatingFileHandler(
-        'logs/errors.log',
-        maxBytes=10240000,  # 10MB
-        backupCount=5
-    )
-    error_handler.setFormatter(logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]\n'
-        'Request: %(method)s %(url)s\n'
-        'User: %(user)s\n'
-        'IP: %(ip)s\n'
-        'User-Agent: %(user_agent)s\n'
-        '--- End Error ---\n'
-    ))
-    error_handler.setLevel(logging.ERROR)
+    if app.debug:
+        app_handler = file_handler
+    else:
+        # Write the main log in batches; errors still go out immediately
+        app_handler = MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        app_handler.setLevel(log_level)
+        atexit.register(app_handler.flush)
+    app_queue_handler = BackgroundQueueHandler(app_handler)
+    app.logger.addHandler(app_queue_handler)
+    log_handlers = [app_queue_handler]
     
-    # Create custom error logger
+    # Error-specific log file, on a custom error logger
     error_logger = logging.getLogger('travel_app.errors')
-    error_logger.addHandler(error_handler)
-    error_logger.setLevel(logging.ERROR)
+    if not error_logger.handlers:
+        error_handler = SizeRotatingFileHandler(
+            'logs/errors.log',
+            maxBytes=10240000,  # 10MB
+            backupCount=5
+        )
+        error_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]\n'
+            'Request: %(method)s %(url)s\n'
+            'User: %(user)s\n'
+            'IP: %(ip)s\n'
+            'User-Agent: %(user_agent)s\n'
+            '--- End Error ---\n'
+        ))
+        error_handler.setLevel(logging.ERROR)
+
+        error_queue_handler = BackgroundQueueHandler(error_handler)
+        error_logger.addHandler(error_queue_handler)
+        log_handlers.append(error_queue_handler)
+        error_logger.setLevel(logging.ERROR)
     
+    # User activity audit trail
+    activity_logger = logging.getLogger('travel_app.activity')
+    if not activity_logger.handlers:
+        activity_handler = SizeRotatingFileHandler(
+            'logs/activity.log',
+            maxBytes=10240000,  # 10MB
+            backupCount=5
+        )
+        activity_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        activity_handler.setLevel(logging.INFO)
+
+        activity_queue_handler = BackgroundQueueHandler(activity_handler)
+        activity_logger.addHandler(activity_queue_handler)
+        log_handlers.append(activity_queue_handler)
+        activity_logger.setLevel(logging.INFO)
+        activity_logger.propagate = False
+
+    # Each handler's .listener is the writer thread of the current process
+    app.extensions['log_listeners'] = log_handlers
+
     # Set application logger level
     app.logger.setLevel(log_level)
     
@@ -68,12 +211,27 @@ def setup_logging(app):
     return app
 
 
+def _request_log_context():
+    """
+    Request details shared by the log helpers.
+    Built on first use and kept on g, so a request that logs several
+    entries only reads the environ and headers once.
+    """
+    log_ctx = g.get('log_ctx')
+    if log_ctx is None:
+        log_ctx = g.log_ctx = {
+            'ip': request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown')),
+            'user_agent': request.headers.get('User-Agent', 'Unknown'),
+            'method': request.method,
+            'url': request.url,
+        }
+    return log_ctx
+
+
 def log_error(app, error, context=None):
     """
     Enhanced error logging with request context and user information.
     """
-    from flask_login import current_user
-    
     error_logger = logging.getLogger('travel_app.errors')
     
     # Gather context information
@@ -81,17 +239,20 @@ def log_error(app, error, context=None):
     if hasattr(current_user, 'id') and current_user.is_authenticated:
         user_info = f"User ID: {current_user.id}, Username: {current_user.username}"
     
-    ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
-    user_agent = request.headers.get('User-Agent', 'Unknown')
+    log_ctx = _request_log_context()
+    
+    error_message = str(error)
+    if len(error_message) > MAX_ERROR_MESSAGE_LENGTH:
+        error_message = error_message[:MAX_ERROR_MESSAGE_LENGTH] + '... [truncated]'
     
     # Create detailed error message
     error_details = {
-        'error': str(error),
-        'method': request.method if request else 'Unknown',
-        'url': request.url if request else 'Unknown',
+        'error': error_message,
+        'method': log_ctx['method'],
+        'url': log_ctx['url'],
         'user': user_info,
-        'ip': ip_address,
-        'user_agent': user_agent,
+        'ip': log_ctx['ip'],
+        'user_agent': log_ctx['user_agent'],
     }
     
     if context:
@@ -99,7 +260,7 @@ def log_error(app, error, context=None):
     
     # Log the error with context
     error_logger.error(
-        f"Application Error: {str(error)}",
+        "Application Error: %s", error_message,
         extra={
             'method': error_details['method'],
             'url': error_details['url'],
@@ -110,25 +271,22 @@ def log_error(app, error, context=None):
     )
     
     # Also log to main application logger
-    app.logger.error(f"Error occurred: {str(error)} | Context: {context or 'None'}")
+    app.logger.error("Error occurred: %s | Context: %s", error_message, context or 'None')
 
 
 def log_security_event(app, event_type, details):
     """
     Log security-related events for monitoring.
     """
-    from flask_login import current_user
-    
     security_logger = logging.getLogger('travel_app.security')
     
     user_info = 'Anonymous'
     if hasattr(current_user, 'id') and current_user.is_authenticated:
         user_info = f"User ID: {current_user.id}"
     
-    ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
-    
     security_logger.warning(
-        f"Security Event: {event_type} | User: {user_info} | IP: {ip_address} | Details: {details}"
+        "Security Event: %s | User: %s | IP: %s | Details: %s",
+        event_type, user_info, _request_log_context()['ip'], details
     )
 
 
@@ -137,12 +295,14 @@ def log_user_activity(app, activity, user_id=None, details=None):
     Log user activities for audit trail.
     """
     activity_logger = logging.getLogger('travel_app.activity')
+    if not activity_logger.isEnabledFor(logging.INFO):
+        return
     
     user_info = user_id or 'Unknown'
-    ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
     
     activity_logger.info(
-        f"User Activity: {activity} | User ID: {user_info} | IP: {ip_address} | Details: {details or 'None'}"
+        "User Activity: %s | User ID: %s | IP: %s | Details: %s",
+        activity, user_info, _request_log_context()['ip'], details or 'None'
     )
 
 
@@ -150,6 +310,7 @@ def setup_request_logging(app):
     """
     Set up request-level logging to track performance and errors.
     """
+    debug = app.debug
     
     @app.before_request
     def before_request_logging():
@@ -157,8 +318,8 @@ def setup_request_logging(app):
         g.start_time = time.time()
         
         # Log all requests in debug mode
-        if app.debug:
-            app.logger.debug(f"Request started: {request.method} {request.url}")
+        if debug:
+            app.logger.debug("Request started: %s %s", request.method, request.url)
     
     @app.after_request
     def after_request_logging(response):
@@ -169,15 +330,15 @@ def setup_request_logging(app):
             # Log slow requests
             if response_time > 2.0:
                 app.logger.warning(
-                    f"Slow request: {request.method} {request.url} "
-                    f"took {response_time:.2f}s | Status: {response.status_code}"
+                    "Slow request: %s %s took %.2fs | Status: %d",
+                    request.method, request.url, response_time, response.status_code
                 )
             
             # Log all requests in debug mode
-            if app.debug:
+            if debug:
                 app.logger.debug(
-                    f"Request completed: {request.method} {request.url} "
-                    f"in {response_time:.3f}s | Status: {response.status_code}"
+                    "Request completed: %s %s in %.3fs | Status: %d",
+                    request.method, request.url, response_time, response.status_code
                 )
         
         return response
@@ -200,7 +361,6 @@ def setup_error_monitoring(app):
             return error
         
         # For non-HTTP exceptions, return 500
-        from flask import render_template
         try:
             return render_template('errors/500.html'), 500
         except:
@@ -212,7 +372,6 @@ def setup_error_monitoring(app):
         """Handle 403 Forbidden errors."""
         log_security_event(app, "403_FORBIDDEN", f"Attempted access to forbidden resource: {request.url}")
         try:
-            from flask import render_template
             return render_template('errors/403.html'), 403
         except:
             return "<h1>403 - Forbidden</h1><p>You don't have permission to access this resource.</p>", 403
@@ -220,21 +379,24 @@ def setup_error_monitoring(app):
     @app.errorhandler(404)
     def not_found_error(error):
         """Handle 404 Not Found errors."""
-        app.logger.info(f"404 error: {request.method} {request.url}")
+        app.logger.info("404 error: %s %s", request.method, request.url)
         try:
-            from flask import render_template
             return render_template('errors/404.html'), 404
         except:
             return "<h1>404 - Page Not Found</h1><p>The page you're looking for doesn't exist.</p>", 404
-    
+
+    @app.errorhandler(429)
+    def too_many_requests_error(error):
+        """Handle 429 Too Many Requests from rate_limit without an error log."""
+        app.logger.info("429 rate limited: %s %s", request.method, request.url)
+        return error
+
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 Internal Server errors."""
-        from app import db
         db.session.rollback()
         log_error(app, error, context="500 Internal Server Error")
         try:
-            from flask import render_template
             return render_template('errors/500.html'), 500
         except:
             return "<h1>500 - Internal Server Error</h1><p>Something went wrong on our end.</p>", 500
@@ -5,9 +5,13 @@ This module contains all database table definitions.
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import case, event, exists, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.security import hash_password, verify_password
 from datetime import datetime, date
 from enum import Enum
+import secrets
 
 # Create database instance
 db = SQLAlchemy()
@@ -78,11 +82,11 @@ class User(UserMixin, db.Model):
 
     def set_password(self, password):
         """Hash and set user password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         """Check if provided password matches the hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     def is_admin(self):
         """Check if user has admin role"""
@@ -96,27 +100,33 @@ class User(UserMixin, db.Model):
     @property
     def total_bookings(self):
         """Get total number of bookings made by user"""
-        return len(self.bookings)
+        return db.session.scalar(
+            select(func.count(Booking.id)).where(Booking.user_id == self.id)
+        )
 
     @property
     def completed_bookings(self):
         """Get number of completed bookings"""
-        return len([b for b in self.bookings if b.status == BookingStatus.COMPLETED])
+        return db.session.scalar(
+            select(func.count(Booking.id)).where(
+                Booking.user_id == self.id,
+                Booking.status == BookingStatus.COMPLETED,
+            )
+        )
 
     def can_review_tour(self, tour_id):
         """Check if user can review a specific tour"""
         # User must have completed booking for the tour
-        completed_bookings = [
-            b
-            for b in self.bookings
-            if b.tour_id == tour_id and b.status == BookingStatus.COMPLETED
-        ]
-        if not completed_bookings:
-            return False
-
-        # Check if user already reviewed this tour
-        existing_review = [r for r in self.reviews if r.tour_id == tour_id]
-        return len(existing_review) == 0
+        completed_booking = exists().where(
+            Booking.user_id == self.id,
+            Booking.tour_id == tour_id,
+            Booking.status == BookingStatus.COMPLETED,
+        )
+        # ...and must not have reviewed it already
+        existing_review = exists().where(
+            Review.user_id == self.id, Review.tour_id == tour_id
+        )
+        return bool(db.session.scalar(select(completed_booking & ~existing_review)))
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -194,30 +204,42 @@ class Tour(db.Model):
 
     total_revenue = db.Column(db.Float, default=0.0)
 
-    @property
+    # Counters maintained from bookings and reviews (see _refresh_tour_counters)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    confirmed_participants = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+
+    @hybrid_property
     def average_rating(self):
-        """Calculate average rating from all approved reviews"""
-        approved_reviews = [review for review in self.reviews if review.is_approved]
-        if approved_reviews:
-            return sum(review.rating for review in approved_reviews) / len(
-                approved_reviews
-            )
+        """Average rating of approved reviews"""
+        if self.rating_count:
+            return self.rating_sum / self.rating_count
         return 0.0
 
-    @property
+    @average_rating.expression
+    def average_rating(cls):
+        """Average approved rating as a column expression, for listing queries"""
+        return case(
+            (cls.rating_count > 0, cls.rating_sum * 1.0 / cls.rating_count),
+            else_=0.0,
+        )
+
+    @hybrid_property
     def review_count(self):
         """Count of approved reviews"""
-        return len([review for review in self.reviews if review.is_approved])
+        return self.rating_count or 0
+
+    @review_count.expression
+    def review_count(cls):
+        """Approved review count as a column expression, for listing queries"""
+        return cls.rating_count
 
     @property
     def available_spots(self):
         """Calculate available spots for booking"""
-        confirmed_bookings = sum(
-            booking.participants
-            for booking in self.bookings
-            if booking.status == BookingStatus.CONFIRMED
-        )
-        return max(0, self.max_participants - confirmed_bookings)
+        return max(0, self.max_participants - (self.confirmed_participants or 0))
 
     @property
     def is_available(self):
@@ -315,6 +337,12 @@ class Booking(db.Model):
     # Relationships
     payments = db.relationship("Payment", backref="booking", lazy=True)
 
+    # Indexes for the per-tour and per-user status lookups
+    __table_args__ = (
+        db.Index("ix_booking_tour_status", "tour_id", "status"),
+        db.Index("ix_booking_user_tour_status", "user_id", "tour_id", "status"),
+    )
+
     def __init__(self, **kwargs):
         """Initialize booking with auto-generated reference"""
         super().__init__(**kwargs)
@@ -324,11 +352,8 @@ class Booking(db.Model):
     @staticmethod
     def generate_booking_reference():
         """Generate unique booking reference number"""
-        import random
-        import string
-
         year = datetime.now().year
-        random_part = "".join(random.choices(string.digits, k=6))
+        random_part = secrets.token_hex(3).upper()
         return f"TRV-{year}-{random_part}"
 
     @property
@@ -441,8 +466,11 @@ class Review(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     approved_at = db.Column(db.DateTime)
 
-    # Ensure one review per user per tour
-    __table_args__ = (db.UniqueConstraint("user_id", "tour_id"),)
+    # Ensure one review per user per tour; index approved reviews per tour
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "tour_id"),
+        db.Index("ix_review_tour_approved", "tour_id", "is_approved"),
+    )
 
     def __init__(self, **kwargs):
         """Initialize review with verified purchase check"""
@@ -545,3 +573,91 @@ class InquiryResponse(db.Model):
 
     def __repr__(self):
         return f"<Response {self.id} for Inquiry {self.inquiry_id}>"
+
+
+# Tour counter maintenance
+# Attributes whose changes affect Tour.rating_* / Tour.confirmed_participants
+TOUR_COUNTER_FIELDS = {
+    Booking: ("tour", "tour_id", "status", "participants"),
+    Review: ("tour", "tour_id", "rating", "is_approved"),
+}
+STALE_TOUR_IDS_KEY = "stale_tour_ids"
+STALE_TOUR_CHILDREN_KEY = "stale_tour_children"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_stale_tours(session, flush_context, instances):
+    """Remember which tours have bookings or reviews changing in this flush"""
+    stale_ids = session.info.setdefault(STALE_TOUR_IDS_KEY, set())
+    children = session.info.setdefault(STALE_TOUR_CHILDREN_KEY, [])
+    for obj in session.deleted:
+        if type(obj) in TOUR_COUNTER_FIELDS:
+            stale_ids.add(obj.tour_id)
+    for obj in session.new:
+        # tour_id may only be filled in from obj.tour during the flush
+        if type(obj) in TOUR_COUNTER_FIELDS:
+            children.append(obj)
+    for obj in session.dirty:
+        fields = TOUR_COUNTER_FIELDS.get(type(obj))
+        if not fields:
+            continue
+        state = db.inspect(obj)
+        if not any(state.attrs[key].history.has_changes() for key in fields):
+            continue
+        if state.attrs.tour_id.history.has_changes() or (
+            state.attrs.tour.history.has_changes()
+        ):
+            # Moved to another tour; the row still holds the old tour_id
+            cls = type(obj)
+            stale_ids.add(
+                session.scalar(select(cls.tour_id).where(cls.id == obj.id))
+            )
+        children.append(obj)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_tour_counters(session, flush_context):
+    """Recompute the counters of affected tours from their child rows"""
+    stale = session.info.pop(STALE_TOUR_IDS_KEY, set())
+    children = session.info.pop(STALE_TOUR_CHILDREN_KEY, ())
+    stale.update(obj.tour_id for obj in children)
+    stale.discard(None)
+    if not stale:
+        return
+
+    approved = (Review.tour_id == Tour.id) & Review.is_approved.is_(True)
+    confirmed = (Booking.tour_id == Tour.id) & (
+        Booking.status == BookingStatus.CONFIRMED
+    )
+    session.execute(
+        update(Tour)
+        .where(Tour.id.in_(stale))
+        .values(
+            rating_sum=select(func.coalesce(func.sum(Review.rating), 0))
+            .where(approved)
+            .scalar_subquery(),
+            rating_count=select(func.count(Review.id))
+            .where(approved)
+            .scalar_subquery(),
+            confirmed_participants=select(
+                func.coalesce(func.sum(Booking.participants), 0)
+            )
+            .where(confirmed)
+            .scalar_subquery(),
+            # Counter refreshes are not edits to the tour itself
+            updated_at=Tour.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # Reload the counters on tours already in the session
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Tour) and obj.id in stale:
+            session.expire(obj, ["rating_sum", "rating_count", "confirmed_participants"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_tours(session):
+    """Drop counter bookkeeping left behind by a failed flush"""
+    session.info.pop(STALE_TOUR_IDS_KEY, None)
+    session.info.pop(STALE_TOUR_CHILDREN_KEY, None)
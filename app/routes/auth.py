@@ -52,7 +52,7 @@ def register():
             # Create new user instance
             user = User(
                 username=form.username.data,
-                email=form.email.data.lower(),
+                email=form.email.data,
                 first_name=form.first_name.data,
                 last_name=form.last_name.data,
                 phone=form.phone.data,
@@ -175,7 +175,7 @@ def forgot_password():
     form = ForgotPasswordForm()
 
     if form.validate_on_submit():
-        user = User.query.filter_by(email=form.email.data.lower()).first()
+        user = User.query.filter_by(email=form.email.data).first()
 
         if user:
             # Generate reset token
@@ -273,14 +273,14 @@ def profile():
     Handles profile viewing and updating.
     """
 
-    form = EditProfileForm(current_user.username, current_user.email)
+    form = EditProfileForm(current_user)
 
     if form.validate_on_submit():
         # Update user information
         current_user.first_name = form.first_name.data
         current_user.last_name = form.last_name.data
         current_user.username = form.username.data
-        current_user.email = form.email.data.lower()
+        current_user.email = form.email.data
         current_user.phone = form.phone.data
         current_user.bio = form.bio.data
         current_user.updated_at = datetime.utcnow()
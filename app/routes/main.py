@@ -183,14 +183,14 @@ def send_message():
             )
             db.session.add(inquiry)
             db.session.commit()
-            current_app.logger.info(f"Inquiry saved successfully for {email}")
+            current_app.logger.info("Inquiry saved successfully for %s", email)
             
             # Send confirmation email
             from app.utils import send_inquiry_confirmation_email
             try:
                 send_inquiry_confirmation_email(inquiry)
             except Exception as email_error:
-                current_app.logger.warning(f"Failed to send confirmation email: {str(email_error)}")
+                current_app.logger.warning("Failed to send confirmation email: %s", email_error)
             
             # Process with AI bot (only if bot fields exist)
             try:
@@ -210,9 +210,9 @@ def send_message():
                             if hasattr(inquiry, 'bot_response_sent'):
                                 inquiry.bot_response_sent = True
                             inquiry.status = 'resolved'
-                            current_app.logger.info(f"Bot resolved inquiry {inquiry.id}")
+                            current_app.logger.info("Bot resolved inquiry %s", inquiry.id)
                         except Exception as email_error:
-                            current_app.logger.warning(f"Failed to send bot response: {str(email_error)}")
+                            current_app.logger.warning("Failed to send bot response: %s", email_error)
                     else:
                         # Escalate to human
                         if hasattr(inquiry, 'requires_human_review'):
@@ -222,13 +222,13 @@ def send_message():
                         try:
                             send_human_review_notification(inquiry)
                         except Exception as email_error:
-                            current_app.logger.warning(f"Failed to send admin notification: {str(email_error)}")
-                        current_app.logger.info(f"Inquiry {inquiry.id} escalated for human review")
+                            current_app.logger.warning("Failed to send admin notification: %s", email_error)
+                        current_app.logger.info("Inquiry %s escalated for human review", inquiry.id)
                 else:
                     current_app.logger.info("Bot fields not available, skipping bot processing")
                     
             except Exception as bot_error:
-                current_app.logger.warning(f"Bot processing failed: {str(bot_error)}")
+                current_app.logger.warning("Bot processing failed: %s", bot_error)
                 # Continue without bot processing
             
             db.session.commit()
@@ -240,12 +240,12 @@ def send_message():
             
         except Exception as db_error:
             db.session.rollback()
-            current_app.logger.error(f"Database error saving inquiry: {str(db_error)}")
+            current_app.logger.error("Database error saving inquiry: %s", db_error)
             flash("Sorry, there was an error saving your message. Please try again.", "error")
             return redirect(url_for("main.index"))
 
     except Exception as e:
-        current_app.logger.error(f"Unexpected error in send_message: {str(e)}")
+        current_app.logger.error("Unexpected error in send_message: %s", e)
         flash(
             "Sorry, there was an error sending your message. Please try again.", "error"
         )
@@ -6,15 +6,24 @@ This module handles all tour-related routes including listing, details, and mana
 from flask import Blueprint, render_template, request, flash, redirect, url_for, abort
 from flask_login import login_required, current_user
 from app.models import Tour, Category, db, TourStatus
+from app.category_cache import active_category_choices
 from app.decorators import admin_required
 from app.utils import save_tour_image, delete_tour_image
 from sqlalchemy import or_
+from sqlalchemy.orm import defer
 from app.forms import ReviewForm
 from app.models import Review, BookingStatus
 
 # Create tours blueprint
 tours_bp = Blueprint("tours", __name__, url_prefix="/tours")
 
+# Detail-page columns the tour listings never render
+LISTING_DEFERRED_COLUMNS = (
+    defer(Tour.includes),
+    defer(Tour.excludes),
+    defer(Tour.gallery_images),
+)
+
 
 @tours_bp.route("/")
 def index():
@@ -29,7 +38,7 @@ def index():
     page = request.args.get("page", 1, type=int)
 
     # Start with base query
-    query = Tour.query
+    query = Tour.query.options(*LISTING_DEFERRED_COLUMNS)
 
     # Apply search filter
     if search:
@@ -66,8 +75,8 @@ def index():
         page=page, per_page=9, error_out=False  # 9 tours per page (3x3 grid)
     )
 
-    # Get all categories for filter dropdown
-    categories = Category.query.order_by(Category.name).all()
+    # (id, name) of active categories for the filter dropdown, cached
+    categories = active_category_choices()
 
     return render_template(
         "tours/index.html", tours=tours, categories=categories, title="Tours"
@@ -293,14 +302,7 @@ def edit(id):
                 if tour.available_to < today:
                     tour.available_to = today + timedelta(days=30)
                 # Check max_participants vs confirmed bookings
-                confirmed = 0
-                if hasattr(tour, "bookings"):
-                    confirmed = sum(
-                        b.participants
-                        for b in tour.bookings
-                        if getattr(b, "status", None)
-                        and str(getattr(b, "status")) == "BookingStatus.CONFIRMED"
-                    )
+                confirmed = tour.confirmed_participants or 0
                 if tour.max_participants <= confirmed:
                     tour.max_participants = confirmed + 1
                     flash(
@@ -522,8 +524,8 @@ def manage():
     status = request.args.get("status", "")
     page = request.args.get("page", 1, type=int)
 
-    # Start with base query
-    query = Tour.query
+    # Start with base query; the management table shows no description
+    query = Tour.query.options(*LISTING_DEFERRED_COLUMNS, defer(Tour.description))
 
     # Apply search filter
     if search:
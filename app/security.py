@@ -1,11 +1,16 @@
 """
 Security middleware for HTTPS enforcement and proxy handling.
 This module provides middleware to handle HTTPS enforcement properly
-when running behind reverse proxies like nginx or load balancers.
+when running behind reverse proxies like nginx or load balancers,
+and the password hashing helpers used by the User model.
 """
 
-from flask import request
+from concurrent.futures import ProcessPoolExecutor
+import os
+import threading
+from flask import current_app, has_app_context, request
 from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import check_password_hash, generate_password_hash
 
 
 class HTTPSRedirectMiddleware:
@@ -75,3 +80,67 @@ def setup_https_middleware(app):
         )
 
     return app
+
+
+def setup_password_hashing(app):
+    """
+    Enable the password hashing process pool when PASSWORD_HASH_WORKERS
+    is set. Each process creates its own pool on first use, so workers
+    forked from a preloaded master never inherit the master's pool.
+
+    The request still waits for the result, so the pool only frees the
+    worker under async workers (gevent/eventlet), where the wait yields
+    to other requests. With sync or threaded workers it just adds
+    pickling and IPC to every hash; leave the setting at 0 there.
+    """
+    if app.config.get("PASSWORD_HASH_WORKERS", 0):
+        app.extensions["password_hash_pool"] = {
+            "pid": None,
+            "pool": None,
+            "lock": threading.Lock(),
+        }
+
+    return app
+
+
+def _password_hash_pool():
+    """The current process's hashing pool, or None if the app has none."""
+    state = None
+    if has_app_context():
+        state = current_app.extensions.get("password_hash_pool")
+    if state is None:
+        return None
+
+    pid = os.getpid()
+    if state["pid"] != pid:
+        with state["lock"]:
+            if state["pid"] != pid:
+                state["pool"] = ProcessPoolExecutor(
+                    max_workers=current_app.config["PASSWORD_HASH_WORKERS"]
+                )
+                state["pid"] = pid
+    return state["pool"]
+
+
+def _run_password_task(func, *args):
+    """Run a hashing call in the app's pool if it has one, else inline."""
+    pool = _password_hash_pool()
+    if pool is None:
+        return func(*args)
+
+    # Waiting on the future blocks only this request; under gevent the
+    # wait yields to other greenlets while the pool does the work
+    return pool.submit(func, *args).result()
+
+
+def hash_password(password):
+    """Hash a password with the configured PASSWORD_HASH_METHOD."""
+    method = "scrypt"
+    if has_app_context():
+        method = current_app.config.get("PASSWORD_HASH_METHOD", method)
+    return _run_password_task(generate_password_hash, password, method)
+
+
+def verify_password(password_hash, password):
+    """Check a password against a stored hash (any supported method)."""
+    return _run_password_task(check_password_hash, password_hash, password)
@@ -65,3 +65,28 @@ class Config:
     # Force HTTPS for all requests in production
     FORCE_HTTPS = os.environ.get("FORCE_HTTPS", "false").lower() in ["true", "on", "1"]
     SSL_REDIRECT_PORT = int(os.environ.get("SSL_REDIRECT_PORT") or 443)
+
+    # RATE LIMITING SETTINGS
+    # Redis URL shared by all workers for @rate_limit (needs the redis package);
+    # when unset each process keeps its own in-memory window
+    RATELIMIT_REDIS_URL = os.environ.get("RATELIMIT_REDIS_URL")
+
+    # PASSWORD HASHING SETTINGS
+    # Werkzeug hash method for new passwords, e.g. "scrypt" or
+    # "pbkdf2:sha256:600000"; tune the cost once per host
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    # Worker processes for hashing and checking passwords; 0 hashes on the
+    # request thread. Only worth setting with gevent/eventlet workers: sync
+    # and threaded workers wait for the pool anyway
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS") or 0)
+
+    # CACHE SETTINGS
+    # Redis URL used to tell every worker when the cached category choices
+    # change (needs the redis package); when unset each process only sees
+    # its own commits
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+
+    # ADMIN SETTINGS
+    # Flask-Admin is only imported and registered when enabled, so workers
+    # that never serve /admin can turn it off to start faster
+    ENABLE_ADMIN = os.environ.get("ENABLE_ADMIN", "true").lower() in ["true", "on", "1"]
@@ -0,0 +1,39 @@
+"""Add booking and review lookup indexes
+
+Revision ID: 9c863d101814
+Revises: 0981171f949c
+Create Date: 2026-10-16 16:02:11.412087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c863d101814'
+down_revision = '0981171f949c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL;
+    # other backends ignore the postgresql_ option and build them normally
+    with op.get_context().autocommit_block():
+        op.create_index('ix_booking_tour_status', 'booking', ['tour_id', 'status'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_booking_user_tour_status', 'booking',
+                        ['user_id', 'tour_id', 'status'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_review_tour_approved', 'review', ['tour_id', 'is_approved'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_review_tour_approved', table_name='review',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_booking_user_tour_status', table_name='booking',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_booking_tour_status', table_name='booking',
+                      postgresql_concurrently=True)
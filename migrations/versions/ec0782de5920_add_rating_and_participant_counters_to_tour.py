@@ -0,0 +1,49 @@
+"""Add rating and participant counters to Tour model
+
+Revision ID: ec0782de5920
+Revises: 9c863d101814
+Create Date: 2026-10-16 16:41:53.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ec0782de5920'
+down_revision = '9c863d101814'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tour', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('confirmed_participants', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill the counters from existing reviews and bookings
+    op.execute(
+        """
+        UPDATE tour SET
+            rating_sum = COALESCE((
+                SELECT SUM(review.rating) FROM review
+                WHERE review.tour_id = tour.id AND review.is_approved = true
+            ), 0),
+            rating_count = (
+                SELECT COUNT(review.id) FROM review
+                WHERE review.tour_id = tour.id AND review.is_approved = true
+            ),
+            confirmed_participants = COALESCE((
+                SELECT SUM(booking.participants) FROM booking
+                WHERE booking.tour_id = tour.id AND booking.status = 'CONFIRMED'
+            ), 0)
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('tour', schema=None) as batch_op:
+        batch_op.drop_column('confirmed_participants')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')